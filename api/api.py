@@ -97,6 +97,7 @@ class SimulationRequest(BaseModel):
     malware_config: MalwareConfig = Field(..., description="Malware behavior configuration")
     initial_infected: List[str] = Field(..., description="List of initially infected device IDs", example=["device_0", "device_5"])
     max_steps: int = Field(100, description="Maximum simulation steps to run", example=50, ge=1)
+    history_limit: Optional[int] = Field(None, description="Return only the first N steps of the history (0 omits it; default: all)", example=5, ge=0)
     
     class Config:
         json_schema_extra = {
@@ -338,6 +339,11 @@ class SimulationRequest(BaseModel):
         }
 
 
+class BatchSimulationRequest(BaseModel):
+    """Request body for running several independent simulations in one call."""
+    runs: List[SimulationRequest] = Field(..., description="Simulations to run, in order (at least one)")
+
+
 def _apply_node_definitions(network, node_definitions: List[NodeDefinition], distribution: str = "sequential") -> None:
     """
     Apply node definitions (batch logic) to assign attributes to groups of nodes.
@@ -371,6 +377,59 @@ def _apply_node_definitions(network, node_definitions: List[NodeDefinition], dis
             network.set_device_attributes(device_id, **attributes)
 
 
+def _simulate(request: SimulationRequest) -> Dict:
+    """Build the network and malware described by a request, run it, and return its statistics."""
+    from network_model import NetworkGraph
+    from malware_engine.malware_base import Malware
+    from simulation import Simulator
+
+    network = NetworkGraph(network_type=request.network_config.network_type)
+    network.generate_topology(
+        request.network_config.num_nodes,
+        device_attributes=request.network_config.device_attributes,
+        subnets=request.network_config.subnets,
+        interconnects=request.network_config.interconnects
+    )
+
+    if request.network_config.node_definitions:
+        _apply_node_definitions(
+            network, 
+            request.network_config.node_definitions,
+            distribution=request.network_config.node_distribution
+        )
+
+    malware = Malware(
+        malware_id="malware_1",
+        malware_type=request.malware_config.malware_type,
+        infection_rate=request.malware_config.infection_rate,
+        latency=request.malware_config.latency,
+        spread_pattern=request.malware_config.spread_pattern,
+        target_os=request.malware_config.target_os,
+        target_node_types=request.malware_config.target_node_types,
+        avoids_admin=request.malware_config.avoids_admin,
+        requires_interaction=request.malware_config.requires_interaction,
+        bypass_firewall=request.malware_config.bypass_firewall,
+        zero_day=request.malware_config.zero_day,
+        exploits=request.malware_config.exploits,
+        cve_only=request.malware_config.cve_only
+    )
+
+    simulator = Simulator(network, malware)
+    simulator.initialize(request.initial_infected)
+    simulator.run(max_steps=request.max_steps)
+
+    return simulator.get_statistics(history_limit=request.history_limit)
+
+
+async def _receive_json(websocket: WebSocket):
+    """Receive one JSON message, sent either as a text or a binary frame."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    text = message.get("text")
+    return json.loads(text if text is not None else message["bytes"])
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application.
@@ -422,47 +481,25 @@ def create_app() -> FastAPI:
             Simulation results
         """
         try:
-            from network_model import NetworkGraph
-            from malware_engine.malware_base import Malware
-            from simulation import Simulator
-
-            network = NetworkGraph(network_type=request.network_config.network_type)
-            network.generate_topology(
-                request.network_config.num_nodes,
-                device_attributes=request.network_config.device_attributes,
-                subnets=request.network_config.subnets,
-                interconnects=request.network_config.interconnects
-            )
-
-            if request.network_config.node_definitions:
-                _apply_node_definitions(
-                    network, 
-                    request.network_config.node_definitions,
-                    distribution=request.network_config.node_distribution
-                )
-
-            malware = Malware(
-                malware_id="malware_1",
-                malware_type=request.malware_config.malware_type,
-                infection_rate=request.malware_config.infection_rate,
-                latency=request.malware_config.latency,
-                spread_pattern=request.malware_config.spread_pattern,
-                target_os=request.malware_config.target_os,
-                target_node_types=request.malware_config.target_node_types,
-                avoids_admin=request.malware_config.avoids_admin,
-                requires_interaction=request.malware_config.requires_interaction,
-                bypass_firewall=request.malware_config.bypass_firewall,
-                zero_day=request.malware_config.zero_day,
-                exploits=request.malware_config.exploits,
-                cve_only=request.malware_config.cve_only
-            )
-
-            simulator = Simulator(network, malware)
-            simulator.initialize(request.initial_infected)
-            simulator.run(max_steps=request.max_steps)
-
-            return simulator.get_statistics()
+            return _simulate(request)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
+    @app.post("/api/v1/simulate/batch")
+    def run_simulation_batch(request: BatchSimulationRequest) -> Dict:
+        """
+        Run several independent simulations in one request (e.g. a parameter sweep).
+
+        Args:
+            request: Batch of simulation request configurations
+
+        Returns:
+            {"results": [...]} with one statistics dict per run, in request order
+        """
+        if not request.runs:
+            raise HTTPException(status_code=422, detail="runs must contain at least one simulation")
+        try:
+            return {"results": [_simulate(run) for run in request.runs]}
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -484,7 +521,7 @@ def create_app() -> FastAPI:
         
         try:
             while True:
-                data = await websocket.receive_json()
+                data = await _receive_json(websocket)
                 command = data.get("command")
                 
                 # Support legacy single-shot payload (backwards compatibility)
@@ -524,9 +561,9 @@ def create_app() -> FastAPI:
                         nodes_data.append(node_info)
                         
                     links_data = []
-                    for u, v, data in network.graph.edges(data=True):
+                    for u, v, edge_attrs in network.graph.edges(data=True):
                         link = {"source": u, "target": v}
-                        for k, v_attr in data.items():
+                        for k, v_attr in edge_attrs.items():
                             if isinstance(v_attr, (str, int, float, bool)):
                                 link[k] = v_attr
                         links_data.append(link)
@@ -549,9 +586,20 @@ def create_app() -> FastAPI:
                         await websocket.send_json({"type": "error", "message": "Network not built. Send 'build_network' first."})
                         continue
 
+                    history_limit = data.get("history_limit")
+                    if history_limit is not None and (type(history_limit) is not int or history_limit < 0):
+                        await websocket.send_json({"type": "error", "message": "history_limit must be a non-negative integer."})
+                        continue
+
                     malware_config = data.get("malware_config", {})
                     initial_infected = data.get("initial_infected", [])
                     max_steps = data.get("max_steps", 100)
+                    # Steps per frame; above 1, step events are sent in "steps" batches
+                    try:
+                        step_batch = max(1, int(data.get("step_batch", 1)))
+                    except (TypeError, ValueError):
+                        await websocket.send_json({"type": "error", "message": "step_batch must be an integer."})
+                        continue
 
                     malware = Malware(
                         malware_id="malware_1",
@@ -578,22 +626,35 @@ def create_app() -> FastAPI:
                         "initial_infected": len(initial_infected),
                     })
 
+                    pending_steps = []
                     for step_num in range(max_steps):
                         step_data = simulator.step()
 
-                        await websocket.send_json({
+                        step_event = {
                             "type": "step",
                             "step": step_data["step"],
                             "newly_infected": step_data["newly_infected"],
                             "total_infected": step_data["total_infected"],
                             "devices_infected": step_data["devices_infected"],
-                        })
-
-                        if (step_data["newly_infected"] == 0 and 
-                            simulator.current_step > malware.latency):
+                        }
+                        finished = (step_data["newly_infected"] == 0 and
+                                    simulator.current_step > malware.latency)
+
+                        if step_batch == 1:
+                            await websocket.send_json(step_event)
+                        else:
+                            pending_steps.append(step_event)
+                            if len(pending_steps) == step_batch or finished:
+                                await websocket.send_json({"type": "steps", "steps": pending_steps})
+                                pending_steps = []
+
+                        if finished:
                             break
 
-                    stats = simulator.get_statistics()
+                    if pending_steps:
+                        await websocket.send_json({"type": "steps", "steps": pending_steps})
+
+                    stats = simulator.get_statistics(history_limit=history_limit)
                     await websocket.send_json({
                         "type": "complete",
                         "statistics": stats,
@@ -75,6 +75,8 @@ class Malware:
         self.cve_only = cve_only
         
         self.network = network
+        # Random source for spread(); Simulator(seed=...) swaps in a seeded random.Random
+        self.rng = random
         self.infected_devices: Set[str] = set()
         self.attributes = attributes
 
@@ -109,72 +111,86 @@ class Malware:
                 except:
                     pass
             
-            if neighbor_attrs.get('quarantined', False):
+            neighbor_rate = self.neighbor_infection_rate(neighbor_attrs)
+            if neighbor_rate is None:
                 continue
 
-            # CVE Logic
-            node_vulnerabilities = neighbor_attrs.get("vulnerabilities", set())
-            if isinstance(node_vulnerabilities, list):
-                node_vulnerabilities = set(node_vulnerabilities)
-
-            is_exploited = False
-            if self.exploits and node_vulnerabilities:
-                if not self.exploits.isdisjoint(node_vulnerabilities):
-                    is_exploited = True
-
-            if self.cve_only and not is_exploited:
-                continue
-
-            if not is_exploited and neighbor_attrs.get('patch_status') == 'fully_patched' and not self.zero_day:
-                continue
-
-            neighbor_rate = 1.0 if is_exploited else self.infection_rate
-            
-            if not is_exploited:
-                if self.requires_interaction:
-                    neighbor_rate *= 0.6
-                    
-                if neighbor_attrs.get('firewall_enabled') and not self.bypass_firewall:
-                    neighbor_rate *= 0.1
-                
-                if neighbor_attrs.get('antivirus'):
-                    neighbor_rate *= 0.5
-
             if self.avoids_admin and not source_admin:
                 neighbor_admin = neighbor_attrs.get('admin_user', True)
                 if neighbor_admin:
                     continue
 
-            if self.target_os:
-                neighbor_os = str(neighbor_attrs.get('os', '')).lower()
-                if not any(t in neighbor_os for t in self.target_os):
-                     continue
-
-            if self.target_node_types:
-                neighbor_type = str(neighbor_attrs.get('device_type', '')).lower()
-                if neighbor_type not in self.target_node_types:
-                    continue
-
             candidates.append((neighbor, neighbor_rate))
 
         if self.spread_pattern == "bfs":
             for candidate, rate in candidates:
-                if random.random() < rate:
+                if self.rng.random() < rate:
                     newly_infected.append(candidate)
                     
         elif self.spread_pattern == "dfs":
              if candidates:
-                 target, rate = random.choice(candidates)
-                 if random.random() < rate:
+                 target, rate = self.rng.choice(candidates)
+                 if self.rng.random() < rate:
                      newly_infected.append(target)
                      
         else:
             for candidate, rate in candidates:
-                if random.random() < rate:
+                if self.rng.random() < rate:
                     newly_infected.append(candidate)
 
         return newly_infected
 
+    def neighbor_infection_rate(self, neighbor_attrs: Dict) -> Optional[float]:
+        """
+        Infection probability for a neighbor based on its own attributes.
+
+        Returns None if the neighbor can never be infected by this malware
+        (quarantined, patched, not targeted, ...). Source-dependent rules such as
+        avoids_admin are applied by the caller.
+        """
+        if neighbor_attrs.get('quarantined', False):
+            return None
+
+        # CVE Logic
+        node_vulnerabilities = neighbor_attrs.get("vulnerabilities", set())
+        if isinstance(node_vulnerabilities, list):
+            node_vulnerabilities = set(node_vulnerabilities)
+
+        is_exploited = False
+        if self.exploits and node_vulnerabilities:
+            if not self.exploits.isdisjoint(node_vulnerabilities):
+                is_exploited = True
+
+        if self.cve_only and not is_exploited:
+            return None
+
+        if not is_exploited and neighbor_attrs.get('patch_status') == 'fully_patched' and not self.zero_day:
+            return None
+
+        neighbor_rate = 1.0 if is_exploited else self.infection_rate
+        
+        if not is_exploited:
+            if self.requires_interaction:
+                neighbor_rate *= 0.6
+                
+            if neighbor_attrs.get('firewall_enabled') and not self.bypass_firewall:
+                neighbor_rate *= 0.1
+            
+            if neighbor_attrs.get('antivirus'):
+                neighbor_rate *= 0.5
+
+        if self.target_os:
+            neighbor_os = str(neighbor_attrs.get('os', '')).lower()
+            if not any(t in neighbor_os for t in self.target_os):
+                return None
+
+        if self.target_node_types:
+            neighbor_type = str(neighbor_attrs.get('device_type', '')).lower()
+            if neighbor_type not in self.target_node_types:
+                return None
+
+        return neighbor_rate
+
     def get_behavior(self) -> Dict:
         return {
             "type": self.malware_type.value if isinstance(self.malware_type, Enum) else str(self.malware_type),
@@ -191,3 +207,7 @@ class Malware:
 
     def get_infected_count(self) -> int:
         return len(self.infected_devices)
+
+    def reset(self) -> None:
+        """Forget all infections; the malware configuration is kept."""
+        self.infected_devices.clear()
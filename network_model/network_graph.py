@@ -6,20 +6,16 @@ devices and their connections.
 """
 
 import networkx as nx
-from typing import List, Dict, Tuple, Optional
+import numpy as np
+from types import MappingProxyType
+from typing import Iterable, List, Dict, Mapping, Tuple, Optional
 import json
+import pickle
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
 logger = logging.getLogger(__name__)
 
-try:
-    from tqdm import tqdm
-    HAS_TQDM = True
-except ImportError:
-    HAS_TQDM = False
-    logger.warning("tqdm not installed. Install with: pip install tqdm for progress bars")
-
 
 class NetworkGraph:
 
@@ -34,10 +30,15 @@ class NetworkGraph:
         "vulnerabilities": None,
     }
 
+    # Attributes mirrored into per-node NumPy columns for fast aggregation
+    TRACKED_ATTRIBUTES = ("os", "admin_user")
+
     def __init__(self, network_type: str = "scale_free"):
         self.graph = nx.Graph()
         self.network_type = network_type
         self.device_states = {}  # Track device infection states
+        self._reset_attr_index()
+        self._csr = None  # Cached structural adjacency, see the csr property
 
     def add_device(self, device_id: str, **attributes) -> None:
         """ Add a device node with optional attributes. """
@@ -53,6 +54,12 @@ class NetworkGraph:
         self.graph.add_node(device_id, **device_attrs)
         self.device_states[device_id] = "healthy"
 
+        if device_id in self._id_to_idx:
+            self._update_attr_index(device_id, device_attrs)
+        else:
+            self._index_nodes([device_id], device_attrs)
+            self._csr = None
+
     def set_device_attributes(self, device_id: str, **attributes) -> None:
         if device_id not in self.graph.nodes():
             raise ValueError(f"Device {device_id} not found in network")
@@ -62,12 +69,154 @@ class NetworkGraph:
                 value = set(value)
             self.graph.nodes[device_id][key] = value
 
-    def get_device_attributes(self, device_id: str) -> Dict:
+        self._update_attr_index(device_id, attributes)
 
-        if device_id not in self.graph.nodes():
+    def set_device_attributes_bulk(self, attributes: Mapping[str, Dict]) -> None:
+        """ Update several devices at once from a {device_id: {attribute: value}} mapping. """
+        missing = [device_id for device_id in attributes if device_id not in self.graph._node]
+        if missing:
+            raise ValueError(f"Device {missing[0]} not found in network")
+
+        # Same list -> set normalization as set_device_attributes; one networkx call for the rest
+        attributes = {
+            device_id: (dict(device_attrs, vulnerabilities=set(device_attrs["vulnerabilities"]))
+                        if isinstance(device_attrs.get("vulnerabilities"), list) else device_attrs)
+            for device_id, device_attrs in attributes.items()
+        }
+        nx.set_node_attributes(self.graph, attributes)
+
+        for device_id, device_attrs in attributes.items():
+            self._update_attr_index(device_id, device_attrs)
+
+    def _reset_attr_index(self) -> None:
+        """Clear the device index and its attribute columns."""
+        self._id_to_idx: Dict[str, int] = {}
+        # Device IDs in index order, for slicing by position. Devices are indexed
+        # in the order this class inserts them into the graph, so this matches
+        # list(graph.nodes) as long as nodes are only added through NetworkGraph
+        self.device_ids: List[str] = []
+        self._num_indexed = 0
+        # OS strings are factorized: the column holds codes into _os_labels
+        self._os_labels: List[str] = []
+        self._os_label_codes: Dict[str, int] = {}
+        self._attr_arrays: Dict[str, np.ndarray] = {
+            "os": np.empty(0, dtype=np.int32),
+            "admin_user": np.empty(0, dtype=bool),
+        }
+
+    def _os_code(self, os_name) -> int:
+        """Return the factorized code for an OS label, registering it if new."""
+        label = str(os_name)
+        code = self._os_label_codes.get(label)
+        if code is None:
+            code = len(self._os_labels)
+            self._os_label_codes[label] = code
+            self._os_labels.append(label)
+        return code
+
+    def _index_nodes(self, node_ids: List[str], attrs: Dict) -> None:
+        """Append new devices sharing the same attributes to the attribute columns."""
+        index = self._id_to_idx
+        if index:
+            # Devices already indexed (e.g. regenerated over an existing graph) are updated in place
+            tracked = {"os": attrs.get("os", "Unknown"), "admin_user": attrs.get("admin_user")}
+            new_ids = []
+            for node_id in node_ids:
+                if node_id in index:
+                    self._update_attr_index(node_id, tracked)
+                else:
+                    new_ids.append(node_id)
+            node_ids = new_ids
+
+        start = self._num_indexed
+        end = start + len(node_ids)
+        capacity = len(self._attr_arrays["os"])
+        if end > capacity:
+            # Grow geometrically so per-device appends stay amortized O(1)
+            new_capacity = max(end, 2 * capacity)
+            for key, column in self._attr_arrays.items():
+                grown = np.empty(new_capacity, dtype=column.dtype)
+                grown[:start] = column[:start]
+                self._attr_arrays[key] = grown
+
+        self._id_to_idx.update(zip(node_ids, range(start, end)))
+        self.device_ids.extend(node_ids)
+        self._attr_arrays["os"][start:end] = self._os_code(attrs.get("os", "Unknown"))
+        self._attr_arrays["admin_user"][start:end] = bool(attrs.get("admin_user"))
+        self._num_indexed = end
+
+    def _update_attr_index(self, device_id: str, attributes: Dict) -> None:
+        """Mirror tracked attribute changes of a device into the columns."""
+        idx = self._id_to_idx.get(device_id)
+        if idx is None:
+            # Node created outside add_device (e.g. directly on self.graph): index its current attributes
+            self._index_nodes([device_id], self.graph._node[device_id])
+            return
+        if "os" in attributes:
+            self._attr_arrays["os"][idx] = self._os_code(attributes["os"])
+        if "admin_user" in attributes:
+            self._attr_arrays["admin_user"][idx] = bool(attributes["admin_user"])
+
+    def _rebuild_attr_index(self) -> None:
+        """Rebuild the device index and attribute columns from the graph."""
+        self._reset_attr_index()
+        node_ids = list(self.graph.nodes)
+        self._index_nodes(node_ids, {})
+        for node_id, attrs in self.graph.nodes(data=True):
+            self._update_attr_index(node_id, {"os": attrs.get("os", "Unknown"), "admin_user": attrs.get("admin_user")})
+
+    def get_device_attributes(self, device_id: str) -> Mapping:
+        """ Return a read-only view of a device's attributes (use set_device_attributes to modify). """
+        attrs = self.graph._node.get(device_id)
+        if attrs is None:
             raise ValueError(f"Device {device_id} not found in network")
         
-        return dict(self.graph.nodes[device_id])
+        return MappingProxyType(attrs)
+
+    def get_all_device_attributes(self, device_ids: Optional[Iterable[str]] = None) -> Dict[str, Mapping]:
+        """ Read-only attribute views for all devices (or the given IDs), keyed by device ID. """
+        nodes = self.graph._node
+        if device_ids is None:
+            return {device_id: MappingProxyType(attrs) for device_id, attrs in nodes.items()}
+        try:
+            return {device_id: MappingProxyType(nodes[device_id]) for device_id in device_ids}
+        except KeyError as e:
+            raise ValueError(f"Device {e.args[0]} not found in network") from None
+
+    def attribute_mask(self, name: str, device_ids: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Boolean array of bool(attribute) per device.
+
+        Without device_ids, entries follow graph.nodes order (the csr row order
+        the simulators index by). Tracked boolean attributes are read from their
+        column; any other attribute is gathered from the node dicts.
+        """
+        column = self._attr_arrays.get(name)
+        if column is not None and column.dtype == np.bool_:
+            column = column[:self._num_indexed]
+            if device_ids is None:
+                return column.copy()
+            index = self._id_to_idx
+            try:
+                return column[np.fromiter((index[d] for d in device_ids), dtype=np.intp)]
+            except KeyError as e:
+                raise ValueError(f"Device {e.args[0]} not found in network") from None
+
+        nodes = self.graph._node
+        try:
+            return np.fromiter((bool(nodes[d].get(name)) for d in (nodes if device_ids is None else device_ids)),
+                               dtype=np.bool_)
+        except KeyError as e:
+            raise ValueError(f"Device {e.args[0]} not found in network") from None
+
+    def get_os_breakdown(self, device_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Count devices per OS, over the whole network or the given device IDs."""
+        os_column = self._attr_arrays["os"][:self._num_indexed]
+        if device_ids is not None:
+            index = self._id_to_idx
+            os_column = os_column[np.fromiter((index[d] for d in device_ids if d in index), dtype=np.intp)]
+        counts = np.bincount(os_column, minlength=len(self._os_labels))
+        return {label: count for label, count in zip(self._os_labels, counts.tolist()) if count}
 
     def add_connection(self, device1: str, device2: str, connection_type: str = "network", **attributes) -> None:
         """
@@ -80,6 +229,11 @@ class NetworkGraph:
             **attributes: Additional connection attributes (bandwidth, latency, etc.)
         """
         self.graph.add_edge(device1, device2, connection_type=connection_type, **attributes)
+        self._csr = None
+        # add_edge creates missing endpoints as attribute-less nodes; index them too
+        for device_id in (device1, device2):
+            if device_id not in self._id_to_idx:
+                self._index_nodes([device_id], self.graph._node[device_id])
 
     def generate_topology(self, num_nodes: int, use_parallel: bool = True, num_workers: int = 8, device_attributes: Optional[Dict] = None, **kwargs) -> None:
         """
@@ -87,7 +241,7 @@ class NetworkGraph:
         
         Args:
             num_nodes: Number of nodes in the network
-            use_parallel: Use parallel processing for node creation (default: True)
+            use_parallel: Use parallel processing for edge insertion (default: True)
             num_workers: Number of worker threads (default: 8, adjust based on CPU cores)
             device_attributes: Dictionary of default device attributes to apply to all nodes
                               (e.g., {"os": "Windows Server 2019", "patch_status": "patched", ...})
@@ -95,6 +249,7 @@ class NetworkGraph:
         """
         import time
         start_time = time.time()
+        self._csr = None
         
         logger.info(f"Generating {num_nodes}-node {self.network_type} topology...")
         
@@ -125,8 +280,6 @@ class NetworkGraph:
         else:
             raise ValueError(f"Unknown network type: {self.network_type}")
 
-        logger.info("Adding nodes to graph...")
-        
         base_attrs = self.DEFAULT_DEVICE_ATTRIBUTES.copy()
         if device_attributes:
             base_attrs.update(device_attributes)
@@ -137,37 +290,23 @@ class NetworkGraph:
         elif isinstance(base_attrs["vulnerabilities"], list):
             base_attrs["vulnerabilities"] = set(base_attrs["vulnerabilities"])
 
-        node_list = [(f"device_{node}", base_attrs.copy()) for node in base_graph.nodes()]
-        
-        if HAS_TQDM:
-            node_list_iter = tqdm(node_list, desc="Adding nodes", unit="nodes", disable=len(node_list) < 1000)
-        else:
-            node_list_iter = node_list
-            
-        if use_parallel and num_nodes > 1000:
-            batch_size = max(1000, num_nodes // num_workers)
-            with ThreadPoolExecutor(max_workers=num_workers) as executor:
-                futures = []
-                for i in range(0, len(node_list), batch_size):
-                    batch = node_list[i:i+batch_size]
-                    future = executor.submit(self._add_nodes_batch, batch)
-                    futures.append(future)
-                
-                for future in as_completed(futures):
-                    future.result()
-        else:
-            for node_id, attrs in node_list_iter:
-                self.graph.add_node(node_id, **attrs)
-                self.device_states[node_id] = "healthy"
+        # add_nodes_from copies the attribute dict for every node
+        node_list = [(f"device_{node}", base_attrs) for node in base_graph.nodes()]
+
+        logger.info(f"Bulk-inserting {len(node_list)} nodes...")
+        nodes_start = time.time()
+        # Always a single batch: add_nodes_from holds the GIL, so threads gain
+        # nothing, and in-order insertion keeps graph.nodes aligned with the
+        # attribute index (and so with csr rows)
+        self._add_nodes_batch(node_list)
+
+        self._index_nodes([node_id for node_id, _ in node_list], base_attrs)
+        logger.info(f"  Nodes inserted in {time.time() - nodes_start:.2f}s")
 
-        logger.info("Adding edges to graph...")
         edge_list = [(f"device_{u}", f"device_{v}") for u, v in base_graph.edges()]
-        
-        if HAS_TQDM:
-            edge_list_iter = tqdm(edge_list, desc="Adding edges", unit="edges", disable=len(edge_list) < 10000)
-        else:
-            edge_list_iter = edge_list
-            
+
+        logger.info(f"Bulk-inserting {len(edge_list)} edges...")
+        edges_start = time.time()
         if use_parallel and len(edge_list) > 10000:
             batch_size = max(5000, len(edge_list) // num_workers)
             with ThreadPoolExecutor(max_workers=num_workers) as executor:
@@ -180,8 +319,8 @@ class NetworkGraph:
                 for future in as_completed(futures):
                     future.result()
         else:
-            for device1, device2 in edge_list_iter:
-                self.graph.add_edge(device1, device2, connection_type="network")
+            self._add_edges_batch(edge_list)
+        logger.info(f"  Edges inserted in {time.time() - edges_start:.2f}s")
 
         elapsed_time = time.time() - start_time
         logger.info(f"Topology generated in {elapsed_time:.2f}s")
@@ -189,23 +328,35 @@ class NetworkGraph:
         logger.info(f"  Edges: {self.graph.number_of_edges()}")
 
     def _add_nodes_batch(self, node_list: List[Tuple[str, Dict]]) -> None:
-        for node_id, attrs in node_list:
-            self.graph.add_node(node_id, **attrs)
-            self.device_states[node_id] = "healthy"
+        self.graph.add_nodes_from(node_list)
+        self.device_states.update(dict.fromkeys((node_id for node_id, _ in node_list), "healthy"))
 
     def _add_edges_batch(self, edge_list: List[Tuple[str, str]]) -> None:
-        for device1, device2 in edge_list:
-            self.graph.add_edge(device1, device2, connection_type="network")
+        self.graph.add_edges_from(edge_list, connection_type="network")
+
+    @property
+    def csr(self):
+        """
+        Structural adjacency as a uint8 scipy CSR array, rows in graph.nodes order.
+
+        Built on first access and cached until the topology changes through this
+        class; shared by the simulators instead of each walking the graph.
+        """
+        if self._csr is None:
+            self._csr = nx.to_scipy_sparse_array(self.graph, format="csr", dtype=np.uint8, weight=None)
+        return self._csr
 
     def get_neighbors(self, device_id: str) -> List[str]:
         return list(self.graph.neighbors(device_id))
 
-    def get_device_info(self, device_id: str) -> Optional[Dict]:
-        if device_id in self.graph:
-            return dict(self.graph.nodes[device_id])
+    def get_device_info(self, device_id: str) -> Optional[Mapping]:
+        attrs = self.graph._node.get(device_id)
+        if attrs is not None:
+            return MappingProxyType(attrs)
         return None
 
     def to_json(self, filepath: str) -> None:
+        """Save the network as JSON (for interoperability; see to_pickle for speed)."""
         data = {
             "nodes": [{"id": node, **self.graph.nodes[node]} for node in self.graph.nodes()],
             "edges": [
@@ -227,6 +378,9 @@ class NetworkGraph:
 
         self.network_type = data.get("network_type", "unknown")
         self.graph.clear()
+        self.device_states = {}
+        self._reset_attr_index()
+        self._csr = None
 
         for node_data in data.get("nodes", []):
             node_id = node_data.pop("id")
@@ -237,6 +391,28 @@ class NetworkGraph:
             target = edge_data.pop("target")
             self.add_connection(source, target, **edge_data)
 
+    def to_pickle(self, filepath: str) -> None:
+        """
+        Save the network using pickle (protocol 5).
+
+        Much faster than to_json for large graphs; prefer it for persistence
+        and keep to_json for interoperability.
+        """
+        data = {"graph": self.graph, "network_type": self.network_type}
+        with open(filepath, "wb") as f:
+            pickle.dump(data, f, protocol=5)
+
+    def from_pickle(self, filepath: str) -> None:
+        """Load a network saved with to_pickle. Only load files you trust."""
+        with open(filepath, "rb") as f:
+            data = pickle.load(f)
+
+        self.network_type = data.get("network_type", "unknown")
+        self.graph = data["graph"]
+        self.device_states = dict.fromkeys(self.graph._node, "healthy")
+        self._rebuild_attr_index()
+        self._csr = None
+
     def get_statistics(self, skip_expensive: bool = False) -> Dict:
         """Get network statistics including structural metrics and attribute demographics."""
         stats = {
@@ -246,14 +422,8 @@ class NetworkGraph:
         }
         
         # Attribute Demographics (OS and Admin ratio)
-        os_counts = {}
-        admin_count = 0
-        for n in self.graph.nodes:
-            attrs = self.graph.nodes[n]
-            os = attrs.get('os', 'Unknown')
-            os_counts[str(os)] = os_counts.get(str(os), 0) + 1
-            if attrs.get('admin_user'):
-                admin_count += 1
+        os_counts = self.get_os_breakdown()
+        admin_count = int(np.count_nonzero(self._attr_arrays["admin_user"][:self._num_indexed]))
         
         stats["demographics"] = {
             "os_breakdown": os_counts,
@@ -330,25 +500,23 @@ class NetworkGraph:
             if 'device_attributes' in subnet_conf:
                 default_attrs.update(subnet_conf['device_attributes'])
                 
-            # Relabel nodes to be globally unique
-            # Mapping: local_id -> "device_{global_id}"
-            mapping = {node: f"device_{node + node_offset}" for node in sub_G.nodes()}
-            sub_G = nx.relabel_nodes(sub_G, mapping)
-            
-            # Add nodes to main graph with attributes
-            for node_id in sub_G.nodes():
-                self.graph.add_node(node_id, **default_attrs)
-                self.device_states[node_id] = "healthy"
-            logger.debug(f"  Added nodes to main graph: {list(self.graph.nodes())}")
-            
-            # Add edges
-            for u, v in sub_G.edges():
-                self.graph.add_edge(u, v, connection_type="network")
+            # Global IDs are "device_{offset + local_id}"; subnet generators label
+            # nodes 0..num_nodes-1, so local IDs index straight into this list
+            # and no relabel_nodes pass is needed.
+            global_ids = [f"device_{node_offset + i}" for i in range(num_nodes)]
+
+            # Bulk-add nodes and edges to the main graph
+            self.graph.add_nodes_from((node_id, default_attrs) for node_id in global_ids)
+            self.device_states.update(dict.fromkeys(global_ids, "healthy"))
+            self._index_nodes(global_ids, default_attrs)
+            self.graph.add_edges_from(
+                ((global_ids[u], global_ids[v]) for u, v in sub_G.edges()),
+                connection_type="network"
+            )
             
             subnet_graphs.append({
                 "offset": node_offset,
-                "count": num_nodes,
-                "mapping": mapping  # local index -> global ID string
+                "count": num_nodes
             })
             node_offset += num_nodes
 
@@ -358,6 +526,8 @@ class NetworkGraph:
 
         # 3. Create Interconnects (Bridges/Firewalls)
         logger.info("Creating network interconnects...")
+        bridge_edges = []
+        gateway_ids = set()
         for link in interconnects:
             src_subnet = link.get('source_subnet')
             tgt_subnet = link.get('target_subnet')
@@ -382,10 +552,12 @@ class NetworkGraph:
             
             if self.graph.has_node(u_id) and self.graph.has_node(v_id):
                 logger.info(f"  Bridge: {u_id} (Subnet {src_subnet}) <-> {v_id} (Subnet {tgt_subnet})")
-                self.graph.add_edge(u_id, v_id, connection_type="interconnect")
+                bridge_edges.append((u_id, v_id, {"connection_type": "interconnect"}))
                 
                 # Apply firewall/choke point attributes if specified
                 if link.get('firewall'):
-                    self.graph.nodes[u_id]['firewall_enabled'] = True
-                    self.graph.nodes[v_id]['firewall_enabled'] = True
+                    gateway_ids.update((u_id, v_id))
+
+        self.graph.add_edges_from(bridge_edges)
+        nx.set_node_attributes(self.graph, dict.fromkeys(gateway_ids, True), 'firewall_enabled')
         logger.debug(f"Final graph nodes after segmentation: {list(self.graph.nodes())}")
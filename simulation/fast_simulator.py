@@ -9,14 +9,70 @@ It uses sparse matrix operations to calculate spread in bulk.
 import numpy as np
 try:
     import scipy.sparse as sparse
+    from scipy.sparse import csgraph
 except (ImportError, AttributeError):
     sparse = None
 
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional, Any
 
+try:
+    from network_model import NetworkGraph
+except ImportError:
+    from ..network_model import NetworkGraph
+
+try:
+    from .history import StepHistory
+except ImportError:
+    from history import StepHistory
+
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit, prange, parallel_chunksize
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _infect_kernel(exposed, state, timers, infection_rate, latency, seed):
+        """
+        Fused target selection, Bernoulli roll and state update in one pass.
+
+        Runs serially and seeds numba's generator from the simulator's stream,
+        so results stay reproducible for a given FastSimulator seed.
+        Returns the number of new infections.
+        """
+        np.random.seed(seed)
+        new_state = 1 if latency > 0 else 2
+        count = 0
+        for i in range(state.shape[0]):
+            if exposed[i] and state[i] == 0 and np.random.random() < infection_rate:
+                state[i] = new_state
+                timers[i] = latency
+                count += 1
+        return count
+
+    @njit(cache=True, parallel=True, nogil=True)
+    def _csr_bool_matvec(indptr, indices, x, out):
+        """
+        Row-parallel CSR product with a 0/1 vector: out[i] = sum of x over i's neighbors.
+
+        Counts saturate at the maximum of out's dtype; callers only test out > 0.
+        Releases the GIL, so independent simulators can run it from threads.
+        """
+        cap = np.iinfo(out.dtype).max
+        for i in prange(indptr.shape[0] - 1):
+            c = 0
+            for k in range(indptr[i], indptr[i + 1]):
+                c += x[indices[k]]
+            out[i] = min(c, cap)
+
+
 class FastSimulator:
     """
     High-performance simulation engine using vectorization.
@@ -27,22 +83,40 @@ class FastSimulator:
           unless explicitly encoded as masks (future enhancement).
     """
 
-    def __init__(self, adj_matrix: Any, infection_rate: float = 0.35, latency: int = 1):
+    # Below this fraction of infectious nodes, exposure is computed from the
+    # infectious columns only instead of a full SpMV
+    SPARSE_FRONTIER_RATIO = 0.1
+    # Rows handed to a matvec worker thread at a time; small chunks let idle
+    # threads pick up work behind the few hub rows of scale-free graphs
+    MATVEC_CHUNK_SIZE = 1024
+
+    def __init__(self, adj_matrix: Any, infection_rate: float = 0.35, latency: int = 1, seed: Optional[int] = None):
         """
         Initialize the fast simulator.
 
         Args:
-            adj_matrix: Scipy sparse adjacency matrix (N x N)
+            adj_matrix: Adjacency matrix (N x N), sparse or dense, or a NetworkGraph (its
+                        cached csr is used; node i is the i-th node of network.graph).
+                        It is converted to a structural CSR matrix with uint8 entries
+                        (edge weights are ignored).
             infection_rate: Probability of infection (0.0 - 1.0)
             latency: Steps before a node becomes infectious
+            seed: Seed for the simulator's random generator (for reproducible runs)
         """
         if sparse is None:
             raise ImportError("scipy is required for FastSimulator. Install with: pip install scipy numpy")
 
-        self.adj_matrix = adj_matrix
+        if isinstance(adj_matrix, NetworkGraph):
+            adj_matrix = adj_matrix.csr
+
+        # Structural CSR adjacency: uint8 ones keep the SpMV's per-edge traffic minimal
+        self.adj_matrix = sparse.csr_matrix(sparse.csr_matrix(adj_matrix) != 0, dtype=np.uint8)
+        self.adj_matrix.sort_indices()
+        # Column-major copy for cheap column slicing when few nodes are infectious
+        self.adj_csc = self.adj_matrix.tocsc()
         self.infection_rate = infection_rate
         self.latency = latency
-        self.num_nodes = adj_matrix.shape[0]
+        self.num_nodes = self.adj_matrix.shape[0]
         
         # State vectors
         # 0: Susceptible
@@ -52,10 +126,35 @@ class FastSimulator:
         
         # Timers for latency
         self.infection_timers = np.zeros(self.num_nodes, dtype=np.int16)
+        # Per-step scratch buffers, allocated once and reused via out= arguments
+        # Infectious indicator fed to the SpMV. The product accumulates in this dtype,
+        # so use the narrowest unsigned type that holds the maximum degree: exact,
+        # and 1-2 bytes per node instead of 4-8 for the SpMV input and output.
+        degrees = np.diff(self.adj_matrix.indptr)
+        max_degree = int(degrees.max()) if self.num_nodes > 0 else 0
+        self._inf_vec = np.empty(self.num_nodes, dtype=np.promote_types(np.uint8, np.min_scalar_type(max_degree)))
+        self._susc_mask = np.empty(self.num_nodes, dtype=np.bool_)
+        self._target_mask = np.empty(self.num_nodes, dtype=np.bool_)
+        self._ready_mask = np.empty(self.num_nodes, dtype=np.bool_)
+        # Neighbor counts written by the compiled matvec. It accumulates in a register
+        # and saturates on store, so uint16 suffices whatever the degree.
+        self._exposure = np.empty(self.num_nodes, dtype=np.uint16)
+        # Random stream (PCG64) and a reusable buffer for the infection rolls
+        self._rng = np.random.default_rng(seed)
+        self._roll_buf = np.empty(self.num_nodes, dtype=np.float32)
+        # Latent mask as 0/1 int8 so it can be subtracted from the timers directly
+        self._latent_buf = np.empty(self.num_nodes, dtype=np.int8)
         
-        self.history = []
+        # Compiled matvec for step 2 and fused kernel for steps 4-5 when numba is available
+        self._use_kernel = HAS_NUMBA
+        
+        self._history = StepHistory()
         self.current_step = 0
         self.total_infected_count = 0
+        # Running numbers of latent and infectious nodes, so run() needs no
+        # per-step state scan and steps without spreaders skip the exposure pass
+        self._latent_count = 0
+        self._num_infectious = 0
 
     def initialize(self, initial_infected_indices: List[int]) -> None:
         """
@@ -72,6 +171,7 @@ class FastSimulator:
         # Assuming initial seeds are already infectious for simplicity
         self.state[indices] = 2 
         self.total_infected_count = len(indices)
+        self._num_infectious = int(np.count_nonzero(self.state == 2))
 
     def step(self) -> Dict:
         """
@@ -79,72 +179,211 @@ class FastSimulator:
         """
         self.current_step += 1
         
-        # 1. Identify Spreading Nodes (State == 2)
-        infectious_mask = (self.state == 2)
-        
-        # 2. Project infection potential to neighbors
-        # Matrix multiplication: (N x N) * (N x 1) -> (N x 1)
-        # Result[i] > 0 means node i is connected to at least one infectious node
-        exposure_potential = self.adj_matrix.dot(infectious_mask)
+        # With no infectious node nothing can be exposed: skip steps 1-2 and 4-5
+        has_infectious = self._num_infectious > 0
+
+        if has_infectious:
+            # 1. Identify Spreading Nodes (State == 2)
+            np.equal(self.state, 2, out=self._inf_vec)
+            
+            # 2. Project infection potential to neighbors
+            # _target_mask[i] is True if node i is connected to at least one infectious node
+            infectious_indices = np.flatnonzero(self._inf_vec)
+            if len(infectious_indices) < self.SPARSE_FRONTIER_RATIO * self.num_nodes:
+                # Only read the infectious columns: their row indices are the exposed nodes
+                self._target_mask.fill(False)
+                self._target_mask[self.adj_csc[:, infectious_indices].indices] = True
+            elif self._use_kernel:
+                # Compiled row-parallel SpMV on the raw CSR arrays, no scipy dispatch
+                with parallel_chunksize(self.MATVEC_CHUNK_SIZE):
+                    _csr_bool_matvec(self.adj_matrix.indptr, self.adj_matrix.indices, self._inf_vec, self._exposure)
+                np.greater(self._exposure, 0, out=self._target_mask)
+            else:
+                # Matrix multiplication: (N x N) * (N x 1) -> (N x 1)
+                exposure_potential = self.adj_matrix.dot(self._inf_vec)
+                np.greater(exposure_potential, 0, out=self._target_mask)
+
+        # 3. Process Latency (Transition Latent -> Infectious)
+        # Done before new infections are applied so nodes infected in this step
+        # stay latent for the full latency period.
+        if self.latency > 0 and self._latent_count > 0:
+            # Decrement timers for all Latent nodes in one fused pass
+            np.equal(self.state, 1, out=self._latent_buf)
+            np.subtract(self.infection_timers, self._latent_buf, out=self.infection_timers)
+            
+            # Check who finished latency
+            np.less_equal(self.infection_timers, 0, out=self._ready_mask)
+            np.logical_and(self._ready_mask, self._latent_buf.view(np.bool_), out=self._ready_mask)
+            self.state[self._ready_mask] = 2 # Become infectious
+            ready_count = int(np.count_nonzero(self._ready_mask))
+            self._latent_count -= ready_count
+            self._num_infectious += ready_count
+
+        if not has_infectious:
+            new_infections_count = 0
+        elif self._use_kernel:
+            # 4+5. Filter targets and roll for infection in a single compiled pass
+            new_infections_count = _infect_kernel(
+                self._target_mask, self.state, self.infection_timers,
+                self.infection_rate, self.latency, int(self._rng.integers(2**32))
+            )
+            self.total_infected_count += new_infections_count
+        else:
+            new_infections_count = self._infect_targets()
+        if self.latency > 0:
+            self._latent_count += new_infections_count
+        else:
+            self._num_infectious += new_infections_count
+
+        # Record History
+        step_data = {
+            "step": self.current_step,
+            "newly_infected": int(new_infections_count),
+            "total_infected": int(self.total_infected_count),
+            "latent_count": self._latent_count
+        }
+        self._history.append(self.current_step, new_infections_count, self.total_infected_count)
         
-        # 3. Filter Targets
+        return step_data
+
+    @property
+    def history(self) -> List[Dict]:
+        """Per-step history as a list of dicts (materialized on access)."""
+        return self._history.to_list()
+
+    def _infect_targets(self) -> int:
+        """Vectorized NumPy version of steps 4-5; returns the number of new infections."""
+        # 4. Filter Targets
         # Must be Susceptible (State == 0) AND Exposed
-        susceptible_mask = (self.state == 0)
-        target_mask = (exposure_potential > 0) & susceptible_mask
+        np.equal(self.state, 0, out=self._susc_mask)
+        np.logical_and(self._target_mask, self._susc_mask, out=self._target_mask)
         
-        # 4. Probabilistic Infection
-        num_targets = np.count_nonzero(target_mask)
+        # 5. Probabilistic Infection
+        num_targets = np.count_nonzero(self._target_mask)
         new_infections_count = 0
         
         if num_targets > 0:
             # Roll dice for all targets at once
-            rolls = np.random.random(num_targets)
+            rolls = self._roll_buf[:num_targets]
+            self._rng.random(out=rolls, dtype=np.float32)
             success_rolls = rolls < self.infection_rate
             
-            # Map back to node indices
-            target_indices = np.where(target_mask)[0]
-            successful_indices = target_indices[success_rolls]
+            # Narrow the target mask in place to the successful rolls, so the
+            # updates below are masked stores rather than an index gather/scatter
+            self._target_mask[self._target_mask] = success_rolls
             
-            new_infections_count = len(successful_indices)
+            new_infections_count = int(np.count_nonzero(success_rolls))
             
             if new_infections_count > 0:
                 # Update state
                 if self.latency > 0:
                     # Mark as Latent (1) and set timer
-                    self.state[successful_indices] = 1
-                    self.infection_timers[successful_indices] = self.latency
+                    self.state[self._target_mask] = 1
+                    self.infection_timers[self._target_mask] = self.latency
                 else:
                     # Mark as Infectious (2) immediately
-                    self.state[successful_indices] = 2
+                    self.state[self._target_mask] = 2
                     
                 self.total_infected_count += new_infections_count
 
-        # 5. Process Latency (Transition Latent -> Infectious)
-        if self.latency > 0:
-            # Decrement timers for all Latent nodes
-            latent_mask = (self.state == 1)
-            if np.any(latent_mask):
-                self.infection_timers[latent_mask] -= 1
-                
-                # Check who finished latency
-                ready_mask = (self.state == 1) & (self.infection_timers <= 0)
-                self.state[ready_mask] = 2 # Become infectious
-
-        # Record History
-        step_data = {
-            "step": self.current_step,
-            "newly_infected": int(new_infections_count),
-            "total_infected": int(self.total_infected_count)
-        }
-        self.history.append(step_data)
-        
-        return step_data
+        return new_infections_count
 
     def run(self, max_steps: int = 100) -> List[Dict]:
         """Run simulation loop."""
+        self._history.reserve(len(self._history) + max_steps)
+        if self.infection_rate >= 1.0 and self.latency == 0:
+            self._run_deterministic(max_steps)
+            return self.history
         for _ in range(max_steps):
             data = self.step()
             # Stop if no spread and no latent nodes waiting
-            if data["newly_infected"] == 0 and np.sum(self.state == 1) == 0:
+            if data["newly_infected"] == 0 and data["latent_count"] == 0:
                 break
         return self.history
+
+    def _run_deterministic(self, max_steps: int) -> None:
+        """
+        Equivalent of the step loop when every exposure infects at once (rate >= 1, no latency).
+
+        The cascade is then a breadth-first search from the infectious nodes: a node
+        is infected at the step equal to its hop distance. All distances come from
+        one multi-source csgraph call instead of a matvec per step.
+        """
+        if max_steps <= 0:
+            return
+        new_per_step = np.zeros(max_steps, dtype=np.int64)
+        sources = np.flatnonzero(self.state == 2)
+        if len(sources):
+            # Infection flows from column j to row i of the adjacency, i.e. along its transpose
+            dist = csgraph.dijkstra(self.adj_csc.T, directed=True, indices=sources,
+                                    unweighted=True, limit=max_steps, min_only=True)
+            reached = np.isfinite(dist) & (self.state == 0)
+            levels = np.bincount(dist[reached].astype(np.int64), minlength=1)[1:]
+            new_per_step[:len(levels)] = levels
+            self.state[reached] = 2
+            # run() stops after the first step without new infections
+            num_steps = min(len(levels) + 1, max_steps)
+        else:
+            num_steps = 1
+
+        for new_infections_count in new_per_step[:num_steps].tolist():
+            self.current_step += 1
+            self.total_infected_count += new_infections_count
+            self._num_infectious += new_infections_count
+            self._history.append(self.current_step, new_infections_count, self.total_infected_count)
+
+
+# Adjacency matrix shared by all runs in a run_batch worker process
+_batch_adj_matrix = None
+
+
+def _init_batch_worker(data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: tuple) -> None:
+    global _batch_adj_matrix
+    _batch_adj_matrix = sparse.csr_matrix((data, indices, indptr), shape=shape)
+
+
+def _run_batch_config(config: Dict, seed: int) -> List[Dict]:
+    sim = FastSimulator(
+        _batch_adj_matrix,
+        infection_rate=config.get("infection_rate", 0.35),
+        latency=config.get("latency", 1),
+        seed=seed
+    )
+    sim.initialize(config.get("initial_infected", []))
+    return sim.run(max_steps=config.get("max_steps", 100))
+
+
+def run_batch(adj_matrix: Any, configs: List[Dict], n_workers: Optional[int] = None, seed: Optional[int] = None) -> List[List[Dict]]:
+    """
+    Run independent FastSimulator simulations on the same network in parallel processes.
+
+    Args:
+        adj_matrix: Adjacency matrix (N x N) shared by all runs
+        configs: One dict per run with optional keys infection_rate, latency,
+                 initial_infected, max_steps and seed
+        n_workers: Number of worker processes (default: CPU count)
+        seed: Base seed; runs without an explicit seed get independent child
+              seeds spawned from it
+
+    Returns:
+        The history of each run, in the same order as configs
+    """
+    if sparse is None:
+        raise ImportError("scipy is required for FastSimulator. Install with: pip install scipy numpy")
+
+    adj = sparse.csr_matrix(adj_matrix)
+    # Spawned child seeds keep worker streams independent (no shared state inherited via fork)
+    child_seeds = np.random.SeedSequence(seed).spawn(len(configs))
+    seeds = [
+        config["seed"] if config.get("seed") is not None else int(child.generate_state(1)[0])
+        for config, child in zip(configs, child_seeds)
+    ]
+
+    # Spawned workers: numba's parallel threading layer is not fork-safe once started
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_batch_worker,
+        initargs=(adj.data, adj.indices, adj.indptr, adj.shape)
+    ) as executor:
+        return list(executor.map(_run_batch_config, configs, seeds))
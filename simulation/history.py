@@ -0,0 +1,67 @@
+"""
+Structure-of-arrays storage for per-step simulation history.
+
+Recording a step is three scalar stores into NumPy columns instead of
+building a dict per step; the list-of-dicts form is only materialized
+when requested.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+
+class StepHistory:
+    """Growable step / newly_infected / total_infected columns."""
+
+    def __init__(self, capacity: int = 64):
+        self._step = np.empty(capacity, dtype=np.int32)
+        self._newly_infected = np.empty(capacity, dtype=np.int32)
+        self._total_infected = np.empty(capacity, dtype=np.int32)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def reserve(self, capacity: int) -> None:
+        """Ensure room for at least `capacity` steps without reallocating."""
+        if capacity <= len(self._step):
+            return
+        for name in ("_step", "_newly_infected", "_total_infected"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._len] = column[:self._len]
+            setattr(self, name, grown)
+
+    def append(self, step: int, newly_infected: int, total_infected: int) -> None:
+        if self._len == len(self._step):
+            self.reserve(max(2 * self._len, 64))
+        i = self._len
+        self._step[i] = step
+        self._newly_infected[i] = newly_infected
+        self._total_infected[i] = total_infected
+        self._len = i + 1
+
+    def clear(self) -> None:
+        self._len = 0
+
+    @property
+    def step(self) -> np.ndarray:
+        return self._step[:self._len]
+
+    @property
+    def newly_infected(self) -> np.ndarray:
+        return self._newly_infected[:self._len]
+
+    @property
+    def total_infected(self) -> np.ndarray:
+        return self._total_infected[:self._len]
+
+    def to_list(self, limit: Optional[int] = None) -> List[Dict]:
+        """Materialize the history (or its first `limit` steps) as a list of step dicts."""
+        # Clamp so a negative limit cannot slice into the unused buffer capacity
+        n = self._len if limit is None else max(0, min(int(limit), self._len))
+        return [
+            {"step": step, "newly_infected": new, "total_infected": total}
+            for step, new, total in zip(self._step[:n].tolist(), self._newly_infected[:n].tolist(),
+                                        self._total_infected[:n].tolist())
+        ]
@@ -5,6 +5,10 @@ This module handles the main simulation loop and state updates over time.
 """
 
 from typing import Dict, List, Optional
+import logging
+import random
+
+import numpy as np
 
 try:
     from network_model import NetworkGraph
@@ -13,21 +17,157 @@ except ImportError:
     from ..network_model import NetworkGraph
     from ..malware_engine.malware_base import Malware
 
+try:
+    from .history import StepHistory
+except ImportError:
+    from history import StepHistory
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _spread_step(indptr, indices, infected, sources, candidate_rate, admin, quarantined,
+                     avoids_admin, dfs, candidates, newly_infected, seed):
+        """
+        Compiled equivalent of Malware.spread over every source in one pass.
+
+        candidate_rate[i] is the infection probability of node i as a target, or
+        a negative value if it can never be infected. Newly infected node indices
+        are written to newly_infected; returns how many were written. A
+        non-negative seed reseeds numba's generator first (it is separate from
+        NumPy's and the random module's), so seeded simulators are reproducible.
+        """
+        if seed >= 0:
+            np.random.seed(seed)
+        count = 0
+        for s in sources:
+            if quarantined[s]:
+                continue
+
+            # Collect this source's candidates before infecting any of them
+            num_candidates = 0
+            for k in range(indptr[s], indptr[s + 1]):
+                j = indices[k]
+                if infected[j] or candidate_rate[j] < 0.0:
+                    continue
+                if avoids_admin and not admin[s] and admin[j]:
+                    continue
+                candidates[num_candidates] = j
+                num_candidates += 1
+
+            if num_candidates == 0:
+                continue
+
+            if dfs:
+                j = candidates[np.random.randint(num_candidates)]
+                if np.random.random() < candidate_rate[j]:
+                    infected[j] = True
+                    newly_infected[count] = j
+                    count += 1
+            else:
+                for c in range(num_candidates):
+                    j = candidates[c]
+                    if np.random.random() < candidate_rate[j]:
+                        infected[j] = True
+                        newly_infected[count] = j
+                        count += 1
+        return count
+
 
 class Simulator:
 
-    def __init__(self, network: NetworkGraph, malware: Malware):
+    def __init__(self, network: NetworkGraph, malware: Malware, seed: Optional[int] = None):
+        """
+        Args:
+            network: Network to simulate on
+            malware: Malware to spread; its network is set to `network`
+            seed: Seed for reproducible runs. Seeds both the compiled kernel and
+                  Malware.spread (via malware.rng); None keeps the global generators.
+        """
         self.network = network
         self.malware = malware
         
         self.malware.network = network
+        self.seed = seed
+        # Per-step kernel seeds are drawn from this stream when seeded
+        self._rng = np.random.default_rng(seed) if seed is not None else None
+        if seed is not None:
+            self.malware.rng = random.Random(seed)
         
         self.current_step = 0
-        self.history = []
+        self._history = StepHistory()
+        self._history_devices: List[List[str]] = []
         self.infection_timeline = {}
 
+        # Compiled fast path (requires numba and the stock Malware.spread rules)
+        self._use_kernel = HAS_NUMBA and type(malware).spread is Malware.spread
+        self._index_built = False
+        self._csr_built = False
+        # Neighbor lists for the Python path, snapshotted on first use
+        self._neighbors_cache: Optional[Dict[str, tuple]] = None
+
+    def _build_index(self) -> None:
+        """
+        Map device IDs to node indices and mirror the infected set into a boolean mask.
+
+        Both step paths track infection through the mask, so per-step checks are
+        array lookups rather than string hashing.
+        """
+        self._idx_to_id = list(self.network.graph.nodes)
+        self._id_to_idx = {device_id: idx for idx, device_id in enumerate(self._idx_to_id)}
+        self._infected = np.zeros(len(self._idx_to_id), dtype=np.bool_)
+        for device_id in self.malware.infected_devices:
+            self._infected[self._id_to_idx[device_id]] = True
+        self._index_built = True
+
+    def _build_csr(self) -> None:
+        """
+        Snapshot the network into CSR arrays and per-node infection rules.
+
+        Called on the first step; device attributes are treated as static for
+        the rest of the run (reset() discards the snapshot).
+        """
+        if not self._index_built:
+            self._build_index()
+        graph = self.network.graph
+        num_nodes = len(self._idx_to_id)
+
+        # Shared cached adjacency; its rows follow graph.nodes like _idx_to_id
+        csr = self.network.csr
+        self._indptr = csr.indptr
+        self._indices = csr.indices
+        degrees = np.diff(self._indptr)
+
+        self._candidate_rate = np.empty(num_nodes, dtype=np.float64)
+        self._admin = np.empty(num_nodes, dtype=np.bool_)
+        self._quarantined = np.empty(num_nodes, dtype=np.bool_)
+        for idx, (device_id, attrs) in enumerate(graph.nodes(data=True)):
+            rate = self.malware.neighbor_infection_rate(attrs)
+            self._candidate_rate[idx] = -1.0 if rate is None else rate
+            self._admin[idx] = bool(attrs.get('admin_user', True))
+            self._quarantined[idx] = bool(attrs.get('quarantined', False))
+
+        self._candidates = np.empty(max(int(degrees.max()) if num_nodes else 0, 1), dtype=np.int64)
+        self._newly_infected = np.empty(num_nodes, dtype=np.int64)
+        self._csr_built = True
+
     def initialize(self, initial_infected: List[str]) -> None:
         """Initialize the simulation with initially infected devices."""
+        if not self._index_built:
+            self._build_index()
+        # Resolve the device IDs to node indices once, up front
+        missing = [device_id for device_id in initial_infected if device_id not in self._id_to_idx]
+        if missing:
+            raise ValueError(f"Device {missing[0]} not found in network")
+        idx = np.fromiter((self._id_to_idx[d] for d in initial_infected), dtype=np.int64, count=len(initial_infected))
+        self._infected[idx] = True
         for device_id in initial_infected:
             self.malware.mark_infected(device_id)
             self.infection_timeline[device_id] = 0
@@ -35,17 +175,11 @@ class Simulator:
     def step(self) -> Dict:
         """Execute one simulation time step."""
         self.current_step += 1
-        newly_infected = []
 
-        for infected_device in list(self.malware.infected_devices):
-            neighbors = self.network.get_neighbors(infected_device)
-            newly_infected_neighbors = self.malware.spread(infected_device, neighbors)
-
-            for device in newly_infected_neighbors:
-                if device not in self.malware.infected_devices:
-                    self.malware.mark_infected(device)
-                    self.infection_timeline[device] = self.current_step
-                    newly_infected.append(device)
+        if self._use_kernel:
+            newly_infected = self._step_kernel()
+        else:
+            newly_infected = self._step_python()
 
         step_data = {
             "step": self.current_step,
@@ -54,11 +188,85 @@ class Simulator:
             "devices_infected": newly_infected,
         }
 
-        self.history.append(step_data)
+        self._history.append(self.current_step, step_data["newly_infected"], step_data["total_infected"])
+        self._history_devices.append(newly_infected)
         return step_data
 
+    @property
+    def infected_mask(self) -> np.ndarray:
+        """
+        Read-only boolean infection mask in graph.nodes order.
+
+        Aligned with NetworkGraph.attribute_mask, so attribute breakdowns of the
+        infected set are plain array reductions.
+        """
+        if not self._index_built:
+            self._build_index()
+        mask = self._infected.view()
+        mask.flags.writeable = False
+        return mask
+
+    @property
+    def history(self) -> List[Dict]:
+        """Per-step history as a list of dicts (materialized on access)."""
+        return self._history_list()
+
+    def _history_list(self, limit: Optional[int] = None) -> List[Dict]:
+        """Materialize the first `limit` steps of the history (all when None)."""
+        history = self._history.to_list(limit)
+        for step_data, devices in zip(history, self._history_devices):
+            step_data["devices_infected"] = devices
+        return history
+
+    def _step_kernel(self) -> List[str]:
+        """Spread from all infected devices using the compiled CSR kernel."""
+        if not self._csr_built:
+            self._build_csr()
+
+        count = _spread_step(
+            self._indptr, self._indices, self._infected, np.flatnonzero(self._infected),
+            self._candidate_rate, self._admin, self._quarantined,
+            self.malware.avoids_admin, self.malware.spread_pattern == "dfs",
+            self._candidates, self._newly_infected,
+            int(self._rng.integers(2**32)) if self._rng is not None else -1
+        )
+        newly_infected = [self._idx_to_id[idx] for idx in self._newly_infected[:count].tolist()]
+        for device in newly_infected:
+            self.malware.mark_infected(device)
+            self.infection_timeline[device] = self.current_step
+        return newly_infected
+
+    def _step_python(self) -> List[str]:
+        """Spread from all infected devices via Malware.spread (pure Python)."""
+        newly_infected = []
+        if not self._index_built:
+            self._build_index()
+        if self._neighbors_cache is None:
+            # One pass over the adjacency instead of a graph lookup per device per step
+            self._neighbors_cache = {n: tuple(nbrs) for n, nbrs in self.network.graph._adj.items()}
+        neighbors_cache = self._neighbors_cache
+        idx_to_id = self._idx_to_id
+        id_to_idx = self._id_to_idx
+        infected = self._infected
+
+        for source in np.flatnonzero(infected).tolist():
+            infected_device = idx_to_id[source]
+            neighbors = neighbors_cache[infected_device]
+            newly_infected_neighbors = self.malware.spread(infected_device, neighbors)
+
+            for device in newly_infected_neighbors:
+                idx = id_to_idx[device]
+                if not infected[idx]:
+                    infected[idx] = True
+                    self.malware.mark_infected(device)
+                    self.infection_timeline[device] = self.current_step
+                    newly_infected.append(device)
+
+        return newly_infected
+
     def run(self, max_steps: int = 100, stop_condition: Optional[callable] = None) -> List[Dict]:
         """Run the simulation for a specified number of steps."""
+        self._history.reserve(len(self._history) + max_steps)
         for _ in range(max_steps):
             if stop_condition and stop_condition(self):
                 break
@@ -70,8 +278,13 @@ class Simulator:
 
         return self.history
 
-    def get_statistics(self) -> Dict:
-        """Returns comprehensive simulation statistics including speed, attribute analysis, and network topology."""
+    def get_statistics(self, history_limit: Optional[int] = None) -> Dict:
+        """
+        Returns comprehensive simulation statistics including speed, attribute analysis, and network topology.
+
+        Args:
+            history_limit: Include only the first N steps in "history" (0 for none, None for all)
+        """
         total_devices = self.network.graph.number_of_nodes()
         infected_count = self.malware.get_infected_count()
         
@@ -79,29 +292,21 @@ class Simulator:
         network_stats = self.network.get_statistics(skip_expensive=True)
         
         # Calculate Peak Velocity (Speed)
-        new_infections = [step['newly_infected'] for step in self.history]
-        peak_velocity = max(new_infections) if new_infections else 0
-        step_at_peak = new_infections.index(peak_velocity) + 1 if peak_velocity > 0 else 0
+        new_infections = self._history.newly_infected
+        peak_velocity = int(new_infections.max()) if len(new_infections) else 0
+        step_at_peak = int(new_infections.argmax()) + 1 if peak_velocity > 0 else 0
         
-        # Calculate Time to Saturation (Milestones)
+        # Calculate Time to Saturation (Milestones); total_infected never decreases
+        totals = self._history.total_infected
         steps_to_50 = None
         steps_to_90 = None
-        for step in self.history:
-            ratio = step['total_infected'] / total_devices if total_devices > 0 else 0
-            if ratio >= 0.5 and steps_to_50 is None:
-                steps_to_50 = step['step']
-            if ratio >= 0.9 and steps_to_90 is None:
-                steps_to_90 = step['step']
+        if total_devices > 0:
+            idx_50, idx_90 = np.searchsorted(totals, np.array([0.5, 0.9]) * total_devices, side='left')
+            steps_to_50 = int(self._history.step[idx_50]) if idx_50 < len(totals) else None
+            steps_to_90 = int(self._history.step[idx_90]) if idx_90 < len(totals) else None
 
         # Infected Attribute Breakdown
-        infected_os_counts = {}
-        for device_id in self.malware.infected_devices:
-            try:
-                attrs = self.network.get_device_attributes(device_id)
-                os = str(attrs.get('os', 'Unknown'))
-                infected_os_counts[os] = infected_os_counts.get(os, 0) + 1
-            except:
-                pass
+        infected_os_counts = self.network.get_os_breakdown(self.malware.infected_devices)
 
         return {
             "total_steps": self.current_step,
@@ -119,11 +324,18 @@ class Simulator:
             "infected_demographics": {
                 "os_breakdown": infected_os_counts
             },
-            "history": self.history
+            "history": self._history_list(history_limit)
         }
 
-    def reset(self) -> None:
+    def reset(self, initial_infected: Optional[List[str]] = None) -> None:
+        """Clear the run state for reuse, optionally re-seeding with initial_infected."""
         self.current_step = 0
-        self.history = []
+        self._history.clear()
+        self._history_devices = []
         self.infection_timeline = {}
-        self.malware.infected_devices.clear()
+        self.malware.reset()
+        self._index_built = False
+        self._csr_built = False
+        self._neighbors_cache = None
+        if initial_infected:
+            self.initialize(initial_infected)
@@ -7,16 +7,182 @@ Make sure the API server is running before executing this script:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 import json
+import re
 import time
-from typing import Dict, List
 import sys
 import asyncio
 import websockets
-import argparse
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
 
 API_BASE_URL = "http://localhost:8000"
 API_VERSION = "/api/v1"
+SIMULATE_URL = f"{API_BASE_URL}{API_VERSION}/simulate"
+BATCH_URL = f"{SIMULATE_URL}/batch"
+
+# One keep-alive session for every HTTP test: requests reuse pooled connections
+# instead of opening a new TCP connection per call. The pool comfortably covers
+# MAX_CONCURRENT_TESTS; with pool_block, any extra concurrent request waits for
+# a pooled connection instead of opening a throwaway one. Gateway errors (e.g.
+# behind a proxy) are retried twice; connection failures are not, so a stopped
+# server is still reported at once.
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32, pool_block=True,
+                       max_retries=Retry(total=2, connect=0, backoff_factor=0.2,
+                                         status_forcelist=(502, 503, 504), allowed_methods=None,
+                                         raise_on_status=False))
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "identity"})
+atexit.register(SESSION.close)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Seconds allowed to establish a connection. Kept apart from the per-request
+# read timeouts so a server that is down fails fast, while slow simulations
+# (possibly queued behind concurrent tests) still get their full read budget.
+CONNECT_TIMEOUT = 2.0
+
+
+def dumps(obj) -> bytes:
+    """Serialize a request body to JSON bytes (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def pretty(obj) -> str:
+    """Pretty-print a JSON document with two-space indentation."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def loads(data):
+    """Parse a JSON response body (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# WebSocket client options: no per-message compression (pure overhead on localhost),
+# room for large topology messages, and the same fast-failing connect budget
+WS_CONNECT_OPTIONS = {"compression": None, "max_size": 2**22, "open_timeout": CONNECT_TIMEOUT}
+# Seconds to wait for the next WebSocket message before failing the test
+WS_RECV_TIMEOUT = 10.0
+# Messages are received with recv(decode=False) (websockets >= 14): text frames
+# come back as raw bytes, skipping UTF-8 decoding, since loads() parses bytes directly
+
+# Expected failures of an HTTP / WebSocket test: transport errors, undecodable
+# bodies (orjson and json decode errors are ValueErrors) and missing fields.
+# Anything else is a bug in the test and is reported by run_selected_tests.
+HTTP_ERRORS = (requests.RequestException, ValueError, KeyError)
+WS_ERRORS = (websockets.WebSocketException, OSError, ValueError, KeyError)
+
+# Fixed scenario data, built once at import
+# 150 "noisy" vulnerability scan results plus the CVE targeted in test_cve_exploitation
+_CVE_NOISE = tuple(f"CVE-202{i%10}-{10000+i}" for i in range(150))
+_CVE_TARGET = "CVE-2023-1234"
+_CVE_NODE_LIST = list(_CVE_NOISE) + [_CVE_TARGET]
+
+# test_cve_exploitation request body, serialized once. The noisy CVE list
+# exercises the server's O(1) vulnerability lookup. 5000 Nodes total:
+# - 1000 Vulnerable Servers (Have CVE-2023-1234 + 150 noise CVEs)
+# - 4000 Secure Workstations (No CVEs)
+_CVE_BODY = dumps({
+    "network_config": {
+        "num_nodes": 5000,
+        "network_type": "scale_free",
+        "node_definitions": [
+            {
+                "count": 1000,
+                "attributes": {
+                    "device_type": "vulnerable_server",
+                    "os": "Windows Server 2016"
+                },
+                "vulnerabilities": _CVE_NODE_LIST
+            },
+            {
+                "count": 4000,
+                "attributes": {
+                    "device_type": "secure_workstation",
+                    "os": "Windows 10"
+                }
+            }
+        ],
+        "node_distribution": "random"
+    },
+    "malware_config": {
+        "malware_type": "exploit_kit",
+        "infection_rate": 0.5,
+        "latency": 1,
+        "exploits": [_CVE_TARGET],
+        "cve_only": True  # Crucial: ONLY infect nodes with this CVE
+    },
+    "initial_infected": ["device_0"],
+    "max_steps": 30,
+    "history_limit": 0
+})
+
+# Four firewalled bridges between gateway nodes 0-3 of the two test_segmented_network subnets
+_SEGMENTED_INTERCONNECTS = tuple(
+    {"source_subnet": 0, "target_subnet": 1, "source_node": i, "target_node": i, "firewall": True}
+    for i in range(4)
+)
+
+# Payload skeletons for the topology and infection-rate sweeps. Treat them as
+# read-only: each sweep point copies only the nested dict it changes. The demo
+# never reads the step history, so requests ask the server to leave it out.
+_TOPOLOGY_SWEEP_TEMPLATE = {
+    "network_config": {"num_nodes": 30, "network_type": None},
+    "malware_config": {"malware_type": "worm", "infection_rate": 0.35, "latency": 1},
+    "initial_infected": ["device_0"],
+    "max_steps": 50,
+    "history_limit": 0
+}
+_RATE_SWEEP_TEMPLATE = {
+    "network_config": {"num_nodes": 50, "network_type": "scale_free"},
+    "malware_config": {"malware_type": "worm", "infection_rate": None, "latency": 1},
+    "initial_infected": ["device_0"],
+    "max_steps": 50,
+    "history_limit": 0
+}
+
+# Default maximum number of tests running at once in run_selected_tests
+# (override with -j; match it to what the server can simulate in parallel)
+MAX_CONCURRENT_TESTS = 8
+
+# Print full response bodies (set with --verbose)
+VERBOSE = False
+
+# Output buffer of the test running in the current thread/task (None: print directly).
+# Tests run concurrently, so each one collects its lines and they are printed in order.
+_output: ContextVar = ContextVar("output", default=None)
+
+
+def emit(text: str = ""):
+    buffer = _output.get()
+    if buffer is None:
+        print(text)
+    else:
+        buffer.append(text)
+
 
 class Colors:
     HEADER = '\033[95m'
@@ -30,35 +196,52 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# No ANSI escapes when the output is piped to a file or CI log
+if not sys.stdout.isatty():
+    for _name in ("HEADER", "OKBLUE", "OKCYAN", "OKGREEN", "WARNING", "FAIL", "ENDC", "BOLD", "UNDERLINE"):
+        setattr(Colors, _name, "")
+
+# Status line prefixes/suffix, built once instead of on every print_* call
+_HEADER_RULE = f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}"
+_HEADER_END = f"{'='*70}{Colors.ENDC}\n"
+_SUCCESS = f"{Colors.OKGREEN}✓ "
+_ERROR = f"{Colors.FAIL}✗ "
+_INFO = f"{Colors.OKCYAN}ℹ "
+_WARNING = f"{Colors.WARNING}⚠ "
+_END = Colors.ENDC
+_STATUS_PASSED = f"{Colors.OKGREEN}PASSED{Colors.ENDC}"
+_STATUS_FAILED = f"{Colors.FAIL}FAILED{Colors.ENDC}"
+
+
 def print_header(text: str):
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}")
-    print(f"{text:^70}")
-    print(f"{'='*70}{Colors.ENDC}\n")
+    emit(_HEADER_RULE)
+    emit(f"{text:^70}")
+    emit(_HEADER_END)
 
 
 def print_success(text: str):
-    print(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
+    emit(_SUCCESS + text + _END)
 
 
 def print_error(text: str):
-    print(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
+    emit(_ERROR + text + _END)
 
 
 def print_info(text: str):
-    print(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
+    emit(_INFO + text + _END)
 
 
 def print_warning(text: str):
-    print(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
+    emit(_WARNING + text + _END)
 
 
 def test_server_health() -> bool:
     print_header("Testing Server Health")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/health", timeout=(CONNECT_TIMEOUT, 5))
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             print_success(f"Server is healthy: {data}")
             return True
         else:
@@ -66,9 +249,9 @@ def test_server_health() -> bool:
             return False
     except requests.exceptions.ConnectionError:
         print_error("Cannot connect to API server. Make sure it's running:")
-        print(f"  {Colors.OKBLUE}python main.py run{Colors.ENDC}")
+        emit(f"  {Colors.OKBLUE}python main.py run{Colors.ENDC}")
         return False
-    except Exception as e:
+    except HTTP_ERRORS as e:
         print_error(f"Error: {str(e)}")
         return False
 
@@ -77,23 +260,80 @@ def test_root_endpoint() -> bool:
     print_header("Testing Root Endpoint")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/", timeout=(CONNECT_TIMEOUT, 5))
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             print_success("Root endpoint working")
-            print_info(f"Response: {json.dumps(data, indent=2)}")
+            if VERBOSE:
+                print_info(f"Response: {pretty(data)}")
             return True
         else:
             print_error(f"Root endpoint returned status code {response.status_code}")
             return False
-    except Exception as e:
+    except HTTP_ERRORS as e:
         print_error(f"Error: {str(e)}")
         return False
 
 
-def test_simulation_simple(num_nodes: int = 50) -> bool:
-    print_header(f"Testing Simple Simulation ({num_nodes} nodes)")
+def _run_sim(title: str, payload: dict | bytes, report=None, intro: tuple = (), timeout: float = 60,
+             stream: bool = False) -> bool:
+    """
+    POST a simulation request and report on the result.
+
+    Args:
+        title: Header printed before the test
+        payload: /simulate request body, as a dict or already serialized JSON bytes.
+                 No test reads the step history, so dict bodies default to history_limit=0
+        report: Optional callable(data, elapsed_time) printing test-specific results;
+                returning False fails the test. Without one the body is not decoded
+                and only the status code is checked
+        intro: Info lines printed before the request is sent
+        timeout: Read timeout in seconds (connecting is bounded by CONNECT_TIMEOUT)
+        stream: Parse the body straight from the raw socket bytes instead of letting
+                requests buffer it first (worth it only for large responses)
+    """
+    print_header(title)
+    for line in intro:
+        print_info(line)
+    if isinstance(payload, dict):
+        payload = {"history_limit": 0, **payload}
     
+    try:
+        t0 = time.perf_counter_ns()
+        response = SESSION.post(SIMULATE_URL, data=payload if isinstance(payload, bytes) else dumps(payload),
+                                headers=JSON_HEADERS, timeout=(CONNECT_TIMEOUT, timeout), stream=stream)
+        ok = response.status_code == 200
+        try:
+            if not ok:
+                text = response.text
+            elif report is not None:
+                data = loads(response.raw.read(decode_content=True) if stream else response.content)
+        finally:
+            response.close()
+        elapsed_time = (time.perf_counter_ns() - t0) / 1e9
+        
+        if ok:
+            if report is None:
+                print_success(f"Simulation completed in {elapsed_time:.2f}s")
+                return True
+            return report(data, elapsed_time) is not False
+        else:
+            print_error(f"Simulation failed with status code {response.status_code}")
+            print_error(f"Response: {text}")
+            return False
+    except HTTP_ERRORS as e:
+        print_error(f"Error: {str(e)}")
+        return False
+
+
+def _print_totals(data: dict, elapsed_time: float) -> None:
+    print_success(f"Simulation completed in {elapsed_time:.2f}s")
+    print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
+    print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
+    print_info(f"Total Steps: {data['total_steps']}")
+
+
+def test_simulation_simple(num_nodes: int = 50) -> bool:
     payload = {
         "network_config": {
             "num_nodes": num_nodes,
@@ -106,49 +346,29 @@ def test_simulation_simple(num_nodes: int = 50) -> bool:
         "max_steps": 50
     }
     
-    print_info(f"Sending simple simulation request...")
-    
-    try:
-        start_time = time.time()
-        response = requests.post(
-            f"{API_BASE_URL}{API_VERSION}/simulate",
-            json=payload,
-            timeout=60
-        )
-        elapsed_time = time.time() - start_time
+    def report(data, elapsed_time):
+        print_success(f"Simple simulation completed in {elapsed_time:.2f}s")
+        print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
+        print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
         
-        if response.status_code == 200:
-            data = response.json()
-            print_success(f"Simple simulation completed in {elapsed_time:.2f}s")
-            print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
-            print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
+        # Check for new statistics
+        if "performance" in data:
+            perf = data["performance"]
+            print_info(f"Peak Velocity: {perf.get('peak_velocity')} infections/step")
+        else:
+            print_warning("Missing performance stats")
             
-            # Check for new statistics
-            if "performance" in data:
-                perf = data["performance"]
-                print_info(f"Peak Velocity: {perf.get('peak_velocity')} infections/step")
-            else:
-                print_warning("Missing performance stats")
-                
-            if "network_topology" in data:
-                topo = data["network_topology"]
-                print_info(f"Avg Degree: {topo.get('avg_degree', 'N/A')}")
-            else:
-                print_warning("Missing network topology stats")
-
-            return True
+        if "network_topology" in data:
+            topo = data["network_topology"]
+            print_info(f"Avg Degree: {topo.get('avg_degree', 'N/A')}")
         else:
-            print_error(f"Simulation failed with status code {response.status_code}")
-            print_error(f"Response: {response.text}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {str(e)}")
-        return False
+            print_warning("Missing network topology stats")
+    
+    return _run_sim(f"Testing Simple Simulation ({num_nodes} nodes)", payload, report,
+                    intro=("Sending simple simulation request...",))
 
 
 def test_simulation_complex(num_nodes: int = 50) -> bool:
-    print_header(f"Testing Complex Simulation ({num_nodes} nodes)")
-    
     payload = {
         "network_config": {
             "num_nodes": num_nodes,
@@ -174,61 +394,73 @@ def test_simulation_complex(num_nodes: int = 50) -> bool:
         "max_steps": 50
     }
     
-    print_info(f"Sending complex simulation request...")
-    
-    try:
-        start_time = time.time()
-        response = requests.post(
-            f"{API_BASE_URL}{API_VERSION}/simulate",
-            json=payload,
-            timeout=60
-        )
-        elapsed_time = time.time() - start_time
+    def report(data, elapsed_time):
+        print_success(f"Complex simulation completed in {elapsed_time:.2f}s")
+        print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
+        print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
         
-        if response.status_code == 200:
-            data = response.json()
-            print_success(f"Complex simulation completed in {elapsed_time:.2f}s")
-            print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
-            print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
-            
-            # Print Performance Stats
-            if "performance" in data:
-                perf = data["performance"]
-                print_info("\nPerformance Metrics:")
-                print_info(f"  Peak Velocity: {perf.get('peak_velocity')} infections/step")
-                print_info(f"  Step at Peak: {perf.get('step_at_peak')}")
-                print_info(f"  Steps to 50%: {perf.get('steps_to_50_percent')}")
+        perf = data.get("performance")
+        topo = data.get("network_topology")
+        inf_demo = data.get("infected_demographics")
+        
+        # Print Performance Stats
+        if perf is not None:
+            print_info("\nPerformance Metrics:")
+            print_info(f"  Peak Velocity: {perf.get('peak_velocity')} infections/step")
+            print_info(f"  Step at Peak: {perf.get('step_at_peak')}")
+            print_info(f"  Steps to 50%: {perf.get('steps_to_50_percent')}")
+        
+        # Print Network Topology Stats
+        if topo is not None:
+            avg_degree = topo.get('avg_degree')
+            demo = topo.get("demographics")
+            print_info("\nNetwork Topology:")
+            print_info(f"  Nodes: {topo.get('num_nodes')}")
+            print_info(f"  Edges: {topo.get('num_edges')}")
+            if isinstance(avg_degree, (int, float)):
+                print_info(f"  Avg Degree: {avg_degree:.2f}")
+            print_info(f"  Components: {topo.get('num_components', 'N/A')}")
             
-            # Print Network Topology Stats
-            if "network_topology" in data:
-                topo = data["network_topology"]
-                print_info("\nNetwork Topology:")
-                print_info(f"  Nodes: {topo.get('num_nodes')}")
-                print_info(f"  Edges: {topo.get('num_edges')}")
-                if isinstance(topo.get('avg_degree'), (int, float)):
-                    print_info(f"  Avg Degree: {topo.get('avg_degree'):.2f}")
-                print_info(f"  Components: {topo.get('num_components', 'N/A')}")
-                
-                if "demographics" in topo:
-                    demo = topo["demographics"]
-                    print_info(f"  OS Breakdown: {demo.get('os_breakdown')}")
-                    if isinstance(demo.get('admin_ratio'), (int, float)):
-                        print_info(f"  Admin Ratio: {demo.get('admin_ratio'):.2f}")
-
-            # Print Infected Demographics
-            if "infected_demographics" in data:
-                inf_demo = data["infected_demographics"]
-                print_info("\nInfected Demographics:")
-                print_info(f"  By OS: {inf_demo.get('os_breakdown')}")
-
-            print_info("\nNote: Linux nodes should be excluded from infection")
-            return True
-        else:
-            print_error(f"Simulation failed with status code {response.status_code}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {str(e)}")
-        return False
+            if demo is not None:
+                admin_ratio = demo.get('admin_ratio')
+                print_info(f"  OS Breakdown: {demo.get('os_breakdown')}")
+                if isinstance(admin_ratio, (int, float)):
+                    print_info(f"  Admin Ratio: {admin_ratio:.2f}")
+
+        # Print Infected Demographics
+        if inf_demo is not None:
+            print_info("\nInfected Demographics:")
+            print_info(f"  By OS: {inf_demo.get('os_breakdown')}")
+
+        print_info("\nNote: Linux nodes should be excluded from infection")
+    
+    return _run_sim(f"Testing Complex Simulation ({num_nodes} nodes)", payload, report,
+                    intro=("Sending complex simulation request...",))
+
+
+def _simulate_many(payloads: list, timeout: float = 60) -> list:
+    """
+    Run independent simulations and return their results in request order
+    (None for a run that failed).
+
+    All runs go to the server in one /simulate/batch request; servers without
+    that endpoint get concurrent /simulate requests instead.
+    """
+    response = SESSION.post(BATCH_URL, data=dumps({"runs": payloads}), headers=JSON_HEADERS,
+                            timeout=(CONNECT_TIMEOUT, timeout))
+    if response.status_code == 200:
+        return loads(response.content)["results"]
+    if response.status_code != 404:
+        print_error(f"Batch simulation failed with status {response.status_code}")
+        return [None] * len(payloads)
+    
+    def post(payload):
+        return SESSION.post(SIMULATE_URL, data=dumps(payload), headers=JSON_HEADERS,
+                            timeout=(CONNECT_TIMEOUT, timeout))
+    
+    with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+        responses = list(executor.map(post, payloads))
+    return [loads(r.content) if r.status_code == 200 else None for r in responses]
 
 
 def test_different_topologies() -> bool:
@@ -237,44 +469,33 @@ def test_different_topologies() -> bool:
     topologies = ["scale_free", "small_world", "random"]
     results = []
     
+    payloads = []
     for topology in topologies:
         print_info(f"Testing {topology} topology...")
-        
-        payload = {
-            "network_config": {
-                "num_nodes": 30,
-                "network_type": topology
-            },
-            "malware_config": {
-                "malware_type": "worm",
-                "infection_rate": 0.35,
-                "latency": 1
-            },
-            "initial_infected": ["device_0"],
-            "max_steps": 50
-        }
-        
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}{API_VERSION}/simulate",
-                json=payload,
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print_success(f"{topology}: {data['total_infected']}/{data['total_devices']} infected")
-                results.append((topology, data['total_infected'], data['total_devices']))
-            else:
-                print_error(f"{topology} failed with status {response.status_code}")
-        except Exception as e:
-            print_error(f"{topology} error: {str(e)}")
+        payloads.append({
+            **_TOPOLOGY_SWEEP_TEMPLATE,
+            "network_config": {**_TOPOLOGY_SWEEP_TEMPLATE["network_config"], "network_type": topology}
+        })
+    
+    # The simulations are independent: run them all in one batch request
+    try:
+        outcomes = _simulate_many(payloads)
+    except HTTP_ERRORS as e:
+        print_error(f"Error: {str(e)}")
+        return False
+    
+    for topology, data in zip(topologies, outcomes):
+        if data is None:
+            print_error(f"{topology} failed")
+            continue
+        print_success(f"{topology}: {data['total_infected']}/{data['total_devices']} infected")
+        results.append((topology, data['total_infected'], data['total_devices']))
     
     # Compare results
     print_info("\nTopology Comparison:")
     for topology, infected, total in results:
         percentage = (infected / total * 100)
-        print(f"  {topology:15} → {infected:2}/{total} ({percentage:5.1f}%) infected")
+        emit(f"  {topology:15} → {infected:2}/{total} ({percentage:5.1f}%) infected")
     
     return len(results) == len(topologies)
 
@@ -285,51 +506,38 @@ def test_infection_rate_comparison() -> bool:
     infection_rates = [0.1, 0.2, 0.3, 0.4, 0.5]
     results = []
     
+    payloads = []
     for rate in infection_rates:
         print_info(f"Testing infection rate: {rate}")
-        
-        payload = {
-            "network_config": {
-                "num_nodes": 50,
-                "network_type": "scale_free"
-            },
-            "malware_config": {
-                "malware_type": "worm",
-                "infection_rate": rate,
-                "latency": 1
-            },
-            "initial_infected": ["device_0"],
-            "max_steps": 50
-        }
-        
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}{API_VERSION}/simulate",
-                json=payload,
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print_success(f"Rate {rate}: {data['total_infected']} infected in {data['total_steps']} steps")
-                results.append((rate, data['total_infected'], data['total_steps']))
-            else:
-                print_error(f"Rate {rate} failed")
-        except Exception as e:
-            print_error(f"Rate {rate} error: {str(e)}")
+        payloads.append({
+            **_RATE_SWEEP_TEMPLATE,
+            "malware_config": {**_RATE_SWEEP_TEMPLATE["malware_config"], "infection_rate": rate}
+        })
+    
+    # The simulations are independent: run them all in one batch request
+    try:
+        outcomes = _simulate_many(payloads)
+    except HTTP_ERRORS as e:
+        print_error(f"Error: {str(e)}")
+        return False
+    
+    for rate, data in zip(infection_rates, outcomes):
+        if data is None:
+            print_error(f"Rate {rate} failed")
+            continue
+        print_success(f"Rate {rate}: {data['total_infected']} infected in {data['total_steps']} steps")
+        results.append((rate, data['total_infected'], data['total_steps']))
     
     # Show trend
     print_info("\nInfection Rate Comparison:")
     for rate, infected, steps in results:
-        print(f"  Rate {rate}: {infected:3} infected in {steps:2} steps")
+        emit(f"  Rate {rate}: {infected:3} infected in {steps:2} steps")
     
     return len(results) == len(infection_rates)
 
 
 def test_multiple_initial_infected() -> bool:
     """Test simulation with multiple initially infected devices."""
-    print_header("Testing Multiple Initial Infections")
-    
     payload = {
         "network_config": {
             "num_nodes": 100,
@@ -344,36 +552,12 @@ def test_multiple_initial_infected() -> bool:
         "max_steps": 50
     }
     
-    print_info(f"Starting with 4 initially infected devices")
-    
-    try:
-        start_time = time.time()
-        response = requests.post(
-            f"{API_BASE_URL}{API_VERSION}/simulate",
-            json=payload,
-            timeout=60
-        )
-        elapsed_time = time.time() - start_time
-        
-        if response.status_code == 200:
-            data = response.json()
-            print_success(f"Simulation completed in {elapsed_time:.2f}s")
-            print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
-            print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
-            print_info(f"Total Steps: {data['total_steps']}")
-            return True
-        else:
-            print_error(f"Simulation failed with status {response.status_code}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {str(e)}")
-        return False
+    return _run_sim("Testing Multiple Initial Infections", payload, _print_totals,
+                    intro=("Starting with 4 initially infected devices",))
 
 
 def test_device_attributes_all_admin() -> bool:
     """Test simulation with all devices as admin users (normal spread)."""
-    print_header("Testing Device Attributes: All Admin Users")
-    
     payload = {
         "network_config": {
             "num_nodes": 80,
@@ -392,38 +576,16 @@ def test_device_attributes_all_admin() -> bool:
         "max_steps": 50
     }
     
-    print_info("All devices: admin_user=True (normal spread expected)")
+    def report(data, elapsed_time):
+        _print_totals(data, elapsed_time)
+        print_info("Result: Malware spread freely across admin network")
     
-    try:
-        start_time = time.time()
-        response = requests.post(
-            f"{API_BASE_URL}{API_VERSION}/simulate",
-            json=payload,
-            timeout=60
-        )
-        elapsed_time = time.time() - start_time
-        
-        if response.status_code == 200:
-            data = response.json()
-            print_success(f"Simulation completed in {elapsed_time:.2f}s")
-            print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
-            print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
-            print_info(f"Total Steps: {data['total_steps']}")
-            print_info("Result: Malware spread freely across admin network")
-            return True
-        else:
-            print_error(f"Simulation failed with status {response.status_code}")
-            print_error(f"Response: {response.text}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {str(e)}")
-        return False
+    return _run_sim("Testing Device Attributes: All Admin Users", payload, report,
+                    intro=("All devices: admin_user=True (normal spread expected)",))
 
 
 def test_device_attributes_all_non_admin() -> bool:
     """Test simulation with all devices as non-admin users (restricted spread)."""
-    print_header("Testing Device Attributes: All Non-Admin Users")
-    
     payload = {
         "network_config": {
             "num_nodes": 80,
@@ -442,45 +604,23 @@ def test_device_attributes_all_non_admin() -> bool:
         "max_steps": 50
     }
     
-    print_info("All devices: admin_user=False (no spread possible)")
-    print_info("Expected: Infection should be limited to initial device")
-    
-    try:
-        start_time = time.time()
-        response = requests.post(
-            f"{API_BASE_URL}{API_VERSION}/simulate",
-            json=payload,
-            timeout=60
-        )
-        elapsed_time = time.time() - start_time
+    def report(data, elapsed_time):
+        _print_totals(data, elapsed_time)
         
-        if response.status_code == 200:
-            data = response.json()
-            print_success(f"Simulation completed in {elapsed_time:.2f}s")
-            print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
-            print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
-            print_info(f"Total Steps: {data['total_steps']}")
-            
-            # Verify that infection is minimal (only initial device)
-            if data['total_infected'] == 1:
-                print_success("Spread blocked: Non-admin devices cannot infect each other")
-            else:
-                print_info(f"Note: {data['total_infected']} devices infected (topology may allow some spread)")
-            
-            return True
+        # Verify that infection is minimal (only initial device)
+        if data['total_infected'] == 1:
+            print_success("Spread blocked: Non-admin devices cannot infect each other")
         else:
-            print_error(f"Simulation failed with status {response.status_code}")
-            print_error(f"Response: {response.text}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {str(e)}")
-        return False
+            print_info(f"Note: {data['total_infected']} devices infected (topology may allow some spread)")
+    
+    return _run_sim("Testing Device Attributes: All Non-Admin Users", payload, report, intro=(
+        "All devices: admin_user=False (no spread possible)",
+        "Expected: Infection should be limited to initial device",
+    ))
 
 
 def test_device_attributes_mixed() -> bool:
     """Test simulation with mixed admin/non-admin users (70/30 split with random distribution)."""
-    print_header("Testing Device Attributes: Mixed Admin/Non-Admin (70/30 Random)")
-    
     payload = {
         "network_config": {
             "num_nodes": 100,
@@ -500,36 +640,17 @@ def test_device_attributes_mixed() -> bool:
         "max_steps": 50
     }
     
-    print_info("Setup: 100 devices split into batches with RANDOM distribution")
-    print_info("  - Batch 1: 70 devices with admin_user=True (servers)")
-    print_info("  - Batch 2: 30 devices with admin_user=False (workstations)")
-    print_info("  - Distribution: RANDOM (mixed throughout network, not clustered)")
-    print_info("Expected: Admin and non-admin devices mixed, privilege boundaries tested")
-    
-    try:
-        start_time = time.time()
-        response = requests.post(
-            f"{API_BASE_URL}{API_VERSION}/simulate",
-            json=payload,
-            timeout=60
-        )
-        elapsed_time = time.time() - start_time
-        
-        if response.status_code == 200:
-            data = response.json()
-            print_success(f"Simulation completed in {elapsed_time:.2f}s")
-            print_info(f"Total Infected: {data['total_infected']}/{data['total_devices']}")
-            print_info(f"Infection Percentage: {data['infection_percentage']:.2f}%")
-            print_info(f"Total Steps: {data['total_steps']}")
-            print_info("Result: Random distribution creates realistic network with mixed device types")
-            return True
-        else:
-            print_error(f"Simulation failed with status {response.status_code}")
-            print_error(f"Response: {response.text}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {str(e)}")
-        return False
+    def report(data, elapsed_time):
+        _print_totals(data, elapsed_time)
+        print_info("Result: Random distribution creates realistic network with mixed device types")
+    
+    return _run_sim("Testing Device Attributes: Mixed Admin/Non-Admin (70/30 Random)", payload, report, intro=(
+        "Setup: 100 devices split into batches with RANDOM distribution",
+        "  - Batch 1: 70 devices with admin_user=True (servers)",
+        "  - Batch 2: 30 devices with admin_user=False (workstations)",
+        "  - Distribution: RANDOM (mixed throughout network, not clustered)",
+        "Expected: Admin and non-admin devices mixed, privilege boundaries tested",
+    ))
 
 
 async def test_websocket_simulation_simple() -> bool:
@@ -547,33 +668,35 @@ async def test_websocket_simulation_simple() -> bool:
             "malware_type": "custom"
         },
         "initial_infected": ["device_0"],
-        "max_steps": 50
+        "max_steps": 50,
+        "history_limit": 0
     }
     
     print_info(f"Connecting to WebSocket at {websocket_url}")
     
     try:
-        async with websockets.connect(websocket_url) as websocket:
+        async with websockets.connect(websocket_url, **WS_CONNECT_OPTIONS) as websocket:
             print_success("Connected to WebSocket")
-            await websocket.send(json.dumps(payload))
+            await websocket.send(dumps(payload))
             
             step_count = 0
             while True:
                 try:
-                    message = await websocket.recv()
-                    data = json.loads(message)
+                    message = await asyncio.wait_for(websocket.recv(decode=False), timeout=WS_RECV_TIMEOUT)
+                    data = loads(message)
+                    msg_type = data["type"]
                     
-                    if data["type"] == "complete":
+                    if msg_type == "complete":
                         stats = data["statistics"]
                         print_success(f"Simulation completed via WebSocket")
                         print_info(f"Total Steps: {step_count}")
                         print_info(f"Total Infected: {stats['total_infected']}")
                         return True
                     
-                    elif data["type"] == "step":
+                    elif msg_type == "step":
                         step_count += 1
                     
-                    elif data["type"] == "error":
+                    elif msg_type == "error":
                         print_error(f"Server error: {data['message']}")
                         return False
                 
@@ -581,7 +704,7 @@ async def test_websocket_simulation_simple() -> bool:
                     print_error("WebSocket connection timeout")
                     return False
     
-    except Exception as e:
+    except WS_ERRORS as e:
         print_error(f"WebSocket error: {str(e)}")
         return False
 
@@ -645,7 +768,9 @@ async def test_websocket_simulation_complex() -> bool:
             "avoids_admin": False
         },
         "initial_infected": ["device_0"],
-        "max_steps": 50
+        "max_steps": 50,
+        "history_limit": 0,
+        "step_batch": 5  # One "steps" frame per 5 simulation steps
     }
     
     print_info(f"Connecting to WebSocket at {websocket_url}")
@@ -653,40 +778,44 @@ async def test_websocket_simulation_complex() -> bool:
     print_info("Expected: Servers (patched) survive, Workstations/IoT get infected.")
     
     try:
-        async with websockets.connect(websocket_url) as websocket:
+        async with websockets.connect(websocket_url, ping_interval=5, ping_timeout=5, **WS_CONNECT_OPTIONS) as websocket:
             print_success("Connected to WebSocket")
-            await websocket.send(json.dumps(payload))
+            await websocket.send(dumps(payload))
             
             step_count = 0
             while True:
                 try:
-                    message = await websocket.recv()
-                    data = json.loads(message)
+                    message = await asyncio.wait_for(websocket.recv(decode=False), timeout=WS_RECV_TIMEOUT)
+                    data = loads(message)
+                    msg_type = data["type"]
                     
-                    if data["type"] == "complete":
+                    if msg_type == "complete":
                         stats = data["statistics"]
                         print_success(f"Complex simulation completed via WebSocket")
                         print_info(f"Total Steps: {step_count}")
                         print_info(f"Total Infected: {stats['total_infected']}/{stats['total_devices']}")
                         
-                        if "infected_demographics" in stats:
-                            print_info(f"Infected OS Breakdown: {stats['infected_demographics'].get('os_breakdown')}")
+                        inf_demo = stats.get("infected_demographics")
+                        if inf_demo is not None:
+                            print_info(f"Infected OS Breakdown: {inf_demo.get('os_breakdown')}")
                             
                         return True
                     
-                    elif data["type"] == "step":
-                        step_count += 1
-                        if step_count % 5 == 0:
-                            print_info(f"Step {data['step']}: {data['newly_infected']} new -> {data['total_infected']} total")
+                    elif msg_type == "steps":
+                        steps = data["steps"]
+                        step_count += len(steps)
+                        last = steps[-1]
+                        print_info(f"Step {last['step']}: {last['newly_infected']} new -> {last['total_infected']} total")
                     
-                    elif data["type"] == "error":
+                    elif msg_type == "error":
                         print_error(f"Server error: {data['message']}")
                         return False
                         
                 except asyncio.TimeoutError:
+                    print_error("WebSocket connection timeout")
                     return False
                     
-    except Exception as e:
+    except WS_ERRORS as e:
         print_error(f"WebSocket error: {str(e)}")
         return False
 
@@ -717,22 +846,23 @@ async def test_two_phase_protocol() -> bool:
             "latency": 1
         },
         "initial_infected": [], # Will be filled below
-        "max_steps": 30
+        "max_steps": 30,
+        "history_limit": 0
     }
     
     print_info(f"Connecting to WebSocket at {websocket_url}")
     
     try:
-        async with websockets.connect(websocket_url) as websocket:
+        async with websockets.connect(websocket_url, **WS_CONNECT_OPTIONS) as websocket:
             print_success("Connected to WebSocket")
             
             # --- EXECUTE PHASE 1 ---
             print_info("Sending PHASE 1: build_network command...")
-            await websocket.send(json.dumps(phase1_payload))
+            await websocket.send(dumps(phase1_payload))
             
             # Wait for network_ready
-            response = await websocket.recv()
-            data = json.loads(response)
+            response = await asyncio.wait_for(websocket.recv(decode=False), timeout=WS_RECV_TIMEOUT)
+            data = loads(response)
             
             if data.get("type") == "network_ready":
                 topo = data["topology"]
@@ -755,29 +885,30 @@ async def test_two_phase_protocol() -> bool:
                 
             # --- EXECUTE PHASE 2 ---
             print_info("Sending PHASE 2: start_simulation command...")
-            await websocket.send(json.dumps(phase2_payload))
+            await websocket.send(dumps(phase2_payload))
             
             # Read stream until complete
             step_count = 0
             while True:
                 try:
-                    message = await websocket.recv()
-                    data = json.loads(message)
+                    message = await asyncio.wait_for(websocket.recv(decode=False), timeout=WS_RECV_TIMEOUT)
+                    data = loads(message)
+                    msg_type = data["type"]
                     
-                    if data["type"] == "initialized":
+                    if msg_type == "initialized":
                         print_success("Simulation Initialized")
                         
-                    elif data["type"] == "step":
+                    elif msg_type == "step":
                         step_count += 1
                         # print_info(f"Step {data['step']}: {data['newly_infected']} new infections")
                         
-                    elif data["type"] == "complete":
+                    elif msg_type == "complete":
                         stats = data["statistics"]
                         print_success(f"Two-Phase Simulation Completed Successfully!")
                         print_info(f"Total Infected: {stats['total_infected']}/{stats['total_devices']}")
                         return True
                         
-                    elif data["type"] == "error":
+                    elif msg_type == "error":
                         print_error(f"Server Error: {data['message']}")
                         return False
                         
@@ -785,34 +916,24 @@ async def test_two_phase_protocol() -> bool:
                     print_error("Timeout waiting for simulation steps")
                     return False
                     
-    except Exception as e:
+    except WS_ERRORS as e:
         print_error(f"WebSocket Error: {str(e)}")
         return False
 
 
 def test_default_malware() -> bool:
-    print_header("Testing Default Malware Config")
     payload = {
         "network_config": {"num_nodes": 50, "network_type": "scale_free"},
         "malware_config": {"malware_type": "custom"},
         "initial_infected": ["device_0"],
         "max_steps": 20
     }
-    try:
-        response = requests.post(f"{API_BASE_URL}{API_VERSION}/simulate", json=payload, timeout=10)
-        if response.status_code == 200:
-            print_success("Default malware simulation successful")
-            return True
-        else:
-            print_error(f"Failed: {response.status_code} - {response.text}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {e}")
-        return False
+    
+    # Only the status code matters here: no report, so the body is never decoded
+    return _run_sim("Testing Default Malware Config", payload, timeout=10)
 
 
 def test_configured_malware() -> bool:
-    print_header("Testing Fully Configured Malware")
     payload = {
         "network_config": {"num_nodes": 50, "network_type": "scale_free"},
         "malware_config": {
@@ -825,24 +946,15 @@ def test_configured_malware() -> bool:
         "initial_infected": ["device_0"],
         "max_steps": 20
     }
-    try:
-        response = requests.post(f"{API_BASE_URL}{API_VERSION}/simulate", json=payload, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            print_success("Configured malware simulation successful")
-            print_info(f"Infected: {data.get('total_infected')}")
-            return True
-        else:
-            print_error(f"Failed: {response.status_code} - {response.text}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {e}")
-        return False
+    
+    def report(data, elapsed_time):
+        print_success("Configured malware simulation successful")
+        print_info(f"Infected: {data.get('total_infected')}")
+    
+    return _run_sim("Testing Fully Configured Malware", payload, report, timeout=10)
 
 
 def test_segmented_network() -> bool:
-    print_header("Testing Segmented Network (2 Subnets + Firewalls)")
-    
     # Define 2 subnets of 50 nodes each, connected by 4 bridges
     payload = {
         "network_config": {
@@ -852,12 +964,7 @@ def test_segmented_network() -> bool:
                 {"num_nodes": 50, "network_type": "scale_free", "device_attributes": {"os": "Linux"}},
                 {"num_nodes": 50, "network_type": "random", "device_attributes": {"os": "Windows"}}
             ],
-            "interconnects": [
-                {"source_subnet": 0, "target_subnet": 1, "source_node": 0, "target_node": 0, "firewall": True},
-                {"source_subnet": 0, "target_subnet": 1, "source_node": 1, "target_node": 1, "firewall": True},
-                {"source_subnet": 0, "target_subnet": 1, "source_node": 2, "target_node": 2, "firewall": True},
-                {"source_subnet": 0, "target_subnet": 1, "source_node": 3, "target_node": 3, "firewall": True}
-            ]
+            "interconnects": _SEGMENTED_INTERCONNECTS
         },
         "malware_config": {
             "malware_type": "custom",
@@ -868,155 +975,128 @@ def test_segmented_network() -> bool:
         "max_steps": 50
     }
     
-    print_info("Scenario: Infection starts in Subnet 0 (Linux). Bridges have Firewall enabled.")
-    
-    try:
-        response = requests.post(f"{API_BASE_URL}{API_VERSION}/simulate", json=payload, timeout=20)
-        if response.status_code == 200:
-            data = response.json()
-            print_success("Segmented simulation successful")
-            
-            # Print Total Network Composition
-            if "network_topology" in data:
-                topo_demo = data["network_topology"].get("demographics", {})
-                print_info(f"Total Network:   {topo_demo.get('os_breakdown')}")
-                
-            # Print Infection Results
-            print_info(f"Total Infected:  {data['total_infected']}")
-            if "infected_demographics" in data:
-                print_info(f"Infection Breakdown: {data['infected_demographics']['os_breakdown']}")
+    def report(data, elapsed_time):
+        print_success("Segmented simulation successful")
+        
+        topo = data.get("network_topology")
+        inf_demo = data.get("infected_demographics")
+        inf_os = (inf_demo or {}).get("os_breakdown") or {}
+        
+        # Print Total Network Composition
+        if topo is not None:
+            topo_demo = topo.get("demographics") or {}
+            print_info(f"Total Network:   {topo_demo.get('os_breakdown')}")
             
-            windows_infected = data.get("infected_demographics", {}).get("os_breakdown", {}).get("Windows", 0)
-            if windows_infected < 10:
-                print_success(f"Firewall effective! Only {windows_infected} Windows nodes infected.")
-            else:
-                print_warning(f"Firewall breached? {windows_infected} Windows nodes infected.")
-                
-            return True
+        # Print Infection Results
+        print_info(f"Total Infected:  {data['total_infected']}")
+        if inf_demo is not None:
+            print_info(f"Infection Breakdown: {inf_demo['os_breakdown']}")
+        
+        windows_infected = inf_os.get("Windows", 0)
+        if windows_infected < 10:
+            print_success(f"Firewall effective! Only {windows_infected} Windows nodes infected.")
         else:
-            print_error(f"Failed: {response.status_code} - {response.text}")
-            return False
-    except Exception as e:
-        print_error(f"Error: {e}")
-        return False
+            print_warning(f"Firewall breached? {windows_infected} Windows nodes infected.")
+    
+    return _run_sim("Testing Segmented Network (2 Subnets + Firewalls)", payload, report, timeout=20,
+                    intro=("Scenario: Infection starts in Subnet 0 (Linux). Bridges have Firewall enabled.",))
 
 
 def test_cve_exploitation() -> bool:
-    print_header("Testing CVE Exploitation (Targeted Attack)")
-    
-    # Generate 150 random CVEs plus our target CVE
-    # This simulates a "noisy" vulnerability scan result to test O(1) lookup performance
-    extra_cves = [f"CVE-202{i%10}-{10000+i}" for i in range(150)]
-    target_cve = "CVE-2023-1234"
-    node_cves = extra_cves + [target_cve]
+    # The fixed 5000-node request body is serialized once at import (_CVE_BODY)
+    payload = _CVE_BODY
     
-    # 50 Nodes total:
-    # - 10 Vulnerable Servers (Have CVE-2023-1234 + 150 noise CVEs)
-    # - 40 Secure Workstations (No CVEs)
-    payload = {
-        "network_config": {
-            "num_nodes": 5000,
-            "network_type": "scale_free",
-            "node_definitions": [
-                {
-                    "count": 1000,
-                    "attributes": {
-                        "device_type": "vulnerable_server",
-                        "os": "Windows Server 2016"
-                    },
-                    "vulnerabilities": node_cves
-                },
-                {
-                    "count": 4000,
-                    "attributes": {
-                        "device_type": "secure_workstation",
-                        "os": "Windows 10"
-                    }
-                }
-            ],
-            "node_distribution": "random"
-        },
-        "malware_config": {
-            "malware_type": "exploit_kit",
-            "infection_rate": 0.5,
-            "latency": 1,
-            "exploits": ["CVE-2023-1234"],
-            "cve_only": True  # Crucial: ONLY infect nodes with this CVE
-        },
-        "initial_infected": ["device_0"],
-        "max_steps": 30
-    }
-    
-    print_info("Scenario: Malware with 'cve_only=True' targeting CVE-2023-1234")
-    print_info("Network: 1000 Vulnerable Nodes (CVE-2023-1234), 4000 Secure Nodes")
-    print_info("Expected: Exactly 1000 nodes (or fewer if disconnected) should be infected.")
-    
-    try:
-        response = requests.post(f"{API_BASE_URL}{API_VERSION}/simulate", json=payload, timeout=20)
-        if response.status_code == 200:
-            data = response.json()
-            total_infected = data['total_infected']
-            
-            print_success("CVE Simulation successful")
-            print_info(f"Total Infected: {total_infected}/5000")
-            print_info(f"Total Steps: {data.get('total_steps', 'N/A')}")
-            
-            if total_infected <= 1000:
-                print_success(f"Perfect! Infection contained to vulnerable nodes (<= 1000).")
-                return True
-            else:
-                print_error(f"Failure! Infection spread to {total_infected} nodes. Should be max 1000.")
-                return False
+    def report(data, elapsed_time):
+        total_infected = data['total_infected']
+        
+        print_success("CVE Simulation successful")
+        print_info(f"Total Infected: {total_infected}/5000")
+        print_info(f"Total Steps: {data.get('total_steps', 'N/A')}")
+        
+        if total_infected <= 1000:
+            print_success(f"Perfect! Infection contained to vulnerable nodes (<= 1000).")
+            return True
         else:
-            print_error(f"Failed: {response.status_code} - {response.text}")
+            print_error(f"Failure! Infection spread to {total_infected} nodes. Should be max 1000.")
             return False
-    except Exception as e:
-        print_error(f"Error: {e}")
-        return False
+    
+    # The largest response in the suite: stream it
+    return _run_sim("Testing CVE Exploitation (Targeted Attack)", payload, report, timeout=20, stream=True, intro=(
+        "Scenario: Malware with 'cve_only=True' targeting CVE-2023-1234",
+        "Network: 1000 Vulnerable Nodes (CVE-2023-1234), 4000 Secure Nodes",
+        "Expected: Exactly 1000 nodes (or fewer if disconnected) should be infected.",
+    ))
+
+
+# All tests as (test_number, test_name, test_function, is_async), built once at import
+TESTS = (
+    (1, "Server Health", test_server_health, False),
+    (2, "Root Endpoint", test_root_endpoint, False),
+    (3, "Simple Simulation", lambda: test_simulation_simple(50), False),
+    (4, "Complex Simulation", lambda: test_simulation_complex(50), False),
+    (5, "Network Topologies", test_different_topologies, False),
+    (6, "Infection Rate Comparison", test_infection_rate_comparison, False),
+    (7, "Multiple Initial Infections", test_multiple_initial_infected, False),
+    (8, "Device Attributes: All Admin", test_device_attributes_all_admin, False),
+    (9, "Device Attributes: All Non-Admin", test_device_attributes_all_non_admin, False),
+    (10, "Device Attributes: Mixed", test_device_attributes_mixed, False),
+    (11, "WebSocket Simple Simulation", test_websocket_simulation_simple, True),
+    (12, "WebSocket Complex Simulation", test_websocket_simulation_complex, True),
+    (13, "Default Malware Config", test_default_malware, False),
+    (14, "Fully Configured Malware", test_configured_malware, False),
+    (15, "Segmented Network Simulation", test_segmented_network, False),
+    (16, "CVE Exploitation Attack", test_cve_exploitation, False),
+    (17, "Two-Phase Protocol (New)", test_two_phase_protocol, True),
+)
+TESTS_BY_NUM = {test[0]: test for test in TESTS}
 
 
 def run_all_tests():
-    # Define all tests as a list of tuples (test_number, test_name, test_function, is_async)
-    tests = [
-        (1, "Server Health", test_server_health, False),
-        (2, "Root Endpoint", test_root_endpoint, False),
-        (3, "Simple Simulation", lambda: test_simulation_simple(50), False),
-        (4, "Complex Simulation", lambda: test_simulation_complex(50), False),
-        (5, "Network Topologies", test_different_topologies, False),
-        (6, "Infection Rate Comparison", test_infection_rate_comparison, False),
-        (7, "Multiple Initial Infections", test_multiple_initial_infected, False),
-        (8, "Device Attributes: All Admin", test_device_attributes_all_admin, False),
-        (9, "Device Attributes: All Non-Admin", test_device_attributes_all_non_admin, False),
-        (10, "Device Attributes: Mixed", test_device_attributes_mixed, False),
-        (11, "WebSocket Simple Simulation", test_websocket_simulation_simple, True),
-        (12, "WebSocket Complex Simulation", test_websocket_simulation_complex, True),
-        (13, "Default Malware Config", test_default_malware, False),
-        (14, "Fully Configured Malware", test_configured_malware, False),
-        (15, "Segmented Network Simulation", test_segmented_network, False),
-        (16, "CVE Exploitation Attack", test_cve_exploitation, False),
-        (17, "Two-Phase Protocol (New)", test_two_phase_protocol, True),
-    ]
-    
-    return tests
+    """Return the test registry (kept for callers of the old function)."""
+    return TESTS
+
+
+# The test menu and its prompt never change, so they are rendered once
+_MENU_TEXT = "\n".join([
+    _HEADER_RULE,
+    f"{'Available Tests':^70}",
+    _HEADER_END,
+    *(f"  {Colors.BOLD}{test_num:2d}{Colors.ENDC}. {test_name}" for test_num, test_name, _, _ in TESTS),
+    f"\n  {Colors.BOLD}0{Colors.ENDC}. Run all tests (default)",
+    f"  {Colors.BOLD}q{Colors.ENDC}. Quit\n",
+])
+_MENU_PROMPT = f"{Colors.BOLD}Select test(s) to run (comma-separated or 0 for all): {Colors.ENDC}"
+# Menu input must be comma-separated test numbers; numbers are then pulled out with findall
+_TEST_LIST_RE = re.compile(r"\s*\d+(\s*,\s*\d+)*\s*")
+_TEST_NUMBER_RE = re.compile(r"\d+")
 
 
 def print_menu():
     """Display the test menu."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}")
-    print(f"{'Available Tests':^70}")
-    print(f"{'='*70}{Colors.ENDC}\n")
-    
-    tests = run_all_tests()
-    
-    for test_num, test_name, _, _ in tests:
-        print(f"  {Colors.BOLD}{test_num:2d}{Colors.ENDC}. {test_name}")
-    
-    print(f"\n  {Colors.BOLD}0{Colors.ENDC}. Run all tests (default)")
-    print(f"  {Colors.BOLD}q{Colors.ENDC}. Quit\n")
+    print(_MENU_TEXT)
+
+
+def write_results_json(path: str, results: dict, durations: dict) -> None:
+    """Write the {test_name: passed} results and their durations as a JSON report."""
+    report = {
+        "passed": sum(1 for v in results.values() if v),
+        "total": len(results),
+        "tests": [
+            {"name": test_name, "passed": bool(result), "duration_s": round(durations[test_name], 4)}
+            for test_name, result in results.items()
+        ],
+    }
+    with open(path, "wb") as f:
+        f.write(dumps(report))
+
 
+def run_selected_tests(test_numbers: list[int] = None, max_concurrency: int = MAX_CONCURRENT_TESTS,
+                       json_path: str = None):
+    """
+    Run selected tests or all tests, at most max_concurrency at a time.
 
-def run_selected_tests(test_numbers: List[int] = None):
-    """Run selected tests or all tests."""
+    If json_path is given, the results are also written there as JSON.
+    """
     print(f"{Colors.BOLD}{Colors.OKBLUE}")
     print("""
 ╔════════════════════════════════════════════════════════════════════════╗
@@ -1026,52 +1106,71 @@ def run_selected_tests(test_numbers: List[int] = None):
     """)
     print(Colors.ENDC)
     
-    tests = run_all_tests()
+    tests = TESTS
     results = {}
+    durations = {}  # Wall-clock seconds per test, excluding time queued for a slot
     
     # Determine which tests to run
     if test_numbers is None or len(test_numbers) == 0:
         # Run all tests
         tests_to_run = tests
     else:
-        # Run only selected tests, maintaining order
-        tests_to_run = [t for t in tests if t[0] in test_numbers]
+        # Run only selected tests, in registry order, each once
+        tests_to_run = [TESTS_BY_NUM[n] for n in sorted(set(test_numbers)) if n in TESTS_BY_NUM]
         if not tests_to_run:
             print_error("No valid test numbers provided")
             return
     
     # Check server health first (always run this)
     if any(t[0] != 1 for t in tests_to_run):
-        health_test = [t for t in tests if t[0] == 1][0]
         print(f"\n{Colors.BOLD}Pre-check: {Colors.ENDC}")
-        test_num, test_name, test_func, _ = health_test
+        test_num, test_name, test_func, _ = TESTS_BY_NUM[1]
+        t0 = time.perf_counter()
         results["Server Health"] = test_func()
+        durations["Server Health"] = time.perf_counter() - t0
         if not results["Server Health"]:
             print_error("\nCannot connect to API server. Aborting tests.")
+            if json_path:
+                write_results_json(json_path, results, durations)
             return
     
-    # Run WebSocket tests with asyncio
-    async_tests = [t for t in tests_to_run if t[3]]
-    sync_tests = [t for t in tests_to_run if not t[3]]
-    
-    # Run synchronous tests
-    for test_num, test_name, test_func, _ in sync_tests:
-        if test_name in results:
-            continue
-        results[test_name] = test_func()
-    
-    # Run asynchronous tests if any
-    if async_tests:
-        print_header("Running WebSocket Tests")
-        
-        async def run_async_tests():
-            async_results = {}
-            for test_num, test_name, test_func, _ in async_tests:
-                async_results[test_name] = await test_func()
-            return async_results
-        
-        websocket_results = asyncio.run(run_async_tests())
-        results.update(websocket_results)
+    # Run HTTP and WebSocket tests concurrently on one event loop; each test's
+    # output is buffered and printed in registry order once all have finished
+    pending_tests = [t for t in tests_to_run if t[1] not in results]
+    
+    async def run_test(semaphore, test_func, is_async):
+        lines = []
+        _output.set(lines)  # Task-local; copied into the worker thread by to_thread
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                if is_async:
+                    result = await test_func()
+                else:
+                    result = await asyncio.to_thread(test_func)
+            except Exception as e:
+                # Last resort: an unexpected error fails this test, not the whole run
+                print_error(f"Unexpected {type(e).__name__}: {e}")
+                result = False
+            elapsed = time.perf_counter() - t0
+        return result, elapsed, lines
+    
+    async def run_tests():
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        return await asyncio.gather(*(
+            run_test(semaphore, test_func, is_async)
+            for _, _, test_func, is_async in pending_tests
+        ))
+    
+    outcomes = uvloop.run(run_tests()) if HAS_UVLOOP else asyncio.run(run_tests())
+    
+    for (_, test_name, _, _), (result, elapsed, lines) in zip(pending_tests, outcomes):
+        if lines:
+            # One write and flush per test instead of one print per line
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+        results[test_name] = result
+        durations[test_name] = elapsed
     
     # Print summary
     print_header("Test Summary")
@@ -1079,23 +1178,35 @@ def run_selected_tests(test_numbers: List[int] = None):
     passed = sum(1 for v in results.values() if v)
     total = len(results)
     
+    lines = []
     for test_name, result in results.items():
-        status = f"{Colors.OKGREEN}PASSED{Colors.ENDC}" if result else f"{Colors.FAIL}FAILED{Colors.ENDC}"
-        print(f"  {test_name:40} → {status}")
+        status = _STATUS_PASSED if result else _STATUS_FAILED
+        lines.append(f"  {test_name:40} → {status}")
     
-    print(f"\n{Colors.BOLD}Total: {passed}/{total} tests passed{Colors.ENDC}")
+    # Where the suite's time goes (tests overlap, so these need not add up)
+    slowest = sorted(durations.items(), key=lambda item: item[1], reverse=True)[:5]
+    lines.append(f"\n{Colors.BOLD}Slowest tests:{Colors.ENDC}")
+    for test_name, elapsed in slowest:
+        lines.append(f"  {test_name:40} {elapsed:7.2f}s")
+    
+    lines.append(f"\n{Colors.BOLD}Total: {passed}/{total} tests passed{Colors.ENDC}")
     
     if passed == total:
-        print(f"\n{Colors.OKGREEN}{Colors.BOLD}✓ All tests passed!{Colors.ENDC}\n")
+        lines.append(f"\n{Colors.OKGREEN}{Colors.BOLD}✓ All tests passed!{Colors.ENDC}\n")
     else:
-        print(f"\n{Colors.WARNING}{Colors.BOLD}⚠ Some tests failed!{Colors.ENDC}\n")
+        lines.append(f"\n{Colors.WARNING}{Colors.BOLD}⚠ Some tests failed!{Colors.ENDC}\n")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    
+    if json_path:
+        write_results_json(json_path, results, durations)
 
 
 def interactive_menu():
     """Run the interactive test menu."""
     while True:
         print_menu()
-        user_input = input(f"{Colors.BOLD}Select test(s) to run (comma-separated or 0 for all): {Colors.ENDC}").strip()
+        user_input = input(_MENU_PROMPT).strip()
         
         if user_input.lower() == 'q':
             print(f"\n{Colors.OKGREEN}Exiting test suite{Colors.ENDC}\n")
@@ -1105,24 +1216,37 @@ def interactive_menu():
             run_selected_tests()
             break
         
-        try:
-            test_numbers = [int(x.strip()) for x in user_input.split(',')]
-            valid_tests = list(range(1, 16))
-            
-            invalid_tests = [t for t in test_numbers if t not in valid_tests]
-            if invalid_tests:
-                print_error(f"Invalid test number(s): {', '.join(map(str, invalid_tests))}")
-                continue
-            
-            run_selected_tests(test_numbers)
-            break
-        except ValueError:
+        if not _TEST_LIST_RE.fullmatch(user_input):
             print_error("Invalid input. Please enter numbers separated by commas.")
             continue
+        
+        test_numbers = list(map(int, _TEST_NUMBER_RE.findall(user_input)))
+        
+        invalid_tests = [t for t in test_numbers if t not in TESTS_BY_NUM]
+        if invalid_tests:
+            print_error(f"Invalid test number(s): {', '.join(map(str, invalid_tests))}")
+            continue
+        
+        run_selected_tests(test_numbers)
+        break
 
 
 if __name__ == "__main__":
     try:
+        # Common invocations are dispatched directly, without building the parser
+        argv = sys.argv[1:]
+        if not argv:
+            run_selected_tests()
+            sys.exit(0)
+        if argv in (['-l'], ['--list']):
+            print_menu()
+            sys.exit(0)
+        if argv in (['-m'], ['--menu']):
+            interactive_menu()
+            sys.exit(0)
+        
+        import argparse  # Only needed when options are given
+        
         parser = argparse.ArgumentParser(
             description="MSpread API Test Suite - Test individual or all API endpoints",
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1132,7 +1256,10 @@ Examples:
   python test_api_demo.py -t 8         # Run test #8 (Multiple Initial Infections)
   python test_api_demo.py -t 1 2 3     # Run tests #1, #2, #3
   python test_api_demo.py -t 9 10 11   # Run WebSocket tests only
+  python test_api_demo.py -j 1         # Run all tests one at a time
   python test_api_demo.py -m           # Interactive menu
+  python test_api_demo.py -v -t 2      # Run test #2 and print the full response
+  python test_api_demo.py --json r.json  # Run all tests and save the results as JSON
             """
         )
         
@@ -1140,7 +1267,7 @@ Examples:
             '-t', '--test',
             nargs='+',
             type=int,
-            help='Test number(s) to run (1-15). Multiple tests can be specified.'
+            help=f'Test number(s) to run (1-{len(TESTS)}). Multiple tests can be specified.'
         )
         
         parser.add_argument(
@@ -1149,6 +1276,25 @@ Examples:
             help='Show interactive menu'
         )
         
+        parser.add_argument(
+            '-j', '--jobs',
+            type=int,
+            default=MAX_CONCURRENT_TESTS,
+            help=f'Maximum number of tests to run concurrently (default: {MAX_CONCURRENT_TESTS}, 1 = sequential)'
+        )
+        
+        parser.add_argument(
+            '-v', '--verbose',
+            action='store_true',
+            help='Print full response bodies'
+        )
+        
+        parser.add_argument(
+            '--json',
+            metavar='PATH',
+            help='Also write the test results to PATH as JSON'
+        )
+        
         parser.add_argument(
             '-l', '--list',
             action='store_true',
@@ -1156,6 +1302,7 @@ Examples:
         )
         
         args = parser.parse_args()
+        VERBOSE = args.verbose
         
         # Handle --list option
         if args.list:
@@ -1169,10 +1316,10 @@ Examples:
         
         # Handle --test option
         if args.test:
-            run_selected_tests(args.test)
+            run_selected_tests(args.test, max_concurrency=args.jobs, json_path=args.json)
         else:
             # Default: run all tests
-            run_selected_tests()
+            run_selected_tests(max_concurrency=args.jobs, json_path=args.json)
     
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}Tests interrupted by user{Colors.ENDC}")
@@ -1,42 +1,44 @@
 #!/usr/bin/env python
 """
 Quick test to show the new device attribute tests are available
+
+Everything runs under __main__: importing test_api_demo at module level
+would pull in requests/websockets on pytest collection and expose its
+live-server test functions for collection.
 """
 
+import importlib
 import sys
-sys.path.insert(0, '.')
 
-# Import test functions
-from test_api_demo import (
-    test_device_attributes_all_admin,
-    test_device_attributes_all_non_admin,
-    test_device_attributes_mixed
+DEVICE_ATTRIBUTE_TESTS = (
+    "test_device_attributes_all_admin",
+    "test_device_attributes_all_non_admin",
+    "test_device_attributes_mixed",
 )
 
-print("✓ Successfully imported new device attribute tests:\n")
-print("  - test_device_attributes_all_admin()")
-print("  - test_device_attributes_all_non_admin()")
-print("  - test_device_attributes_mixed()\n")
-
-print("Available test numbers in test_api_demo.py:")
-print("  1. Server Health")
-print("  2. Root Endpoint")
-print("  3. Worm Simulation (50 nodes)")
-print("  4. Virus Simulation")
-print("  5. Ransomware Simulation")
-print("  6. Network Topologies")
-print("  7. Infection Rate Comparison")
-print("  8. Multiple Initial Infections")
-print("  9. Device Attributes: All Admin")
-print("  10. Device Attributes: All Non-Admin")
-print("  11. Device Attributes: Mixed")
-print("  12. WebSocket Worm Simulation")
-print("  13. WebSocket Virus Simulation")
-print("  14. WebSocket Ransomware Simulation\n")
-
-print("Usage Examples:")
-print("  python test_api_demo.py              # Run all tests")
-print("  python test_api_demo.py -t 9         # Run test 9 (All Admin)")
-print("  python test_api_demo.py -t 10        # Run test 10 (All Non-Admin)")
-print("  python test_api_demo.py -t 11        # Run test 11 (Mixed)")
-print("  python test_api_demo.py -t 9 10 11   # Run all device attribute tests\n")
+if __name__ == "__main__":
+    sys.path.insert(0, '.')
+    demo = importlib.import_module("test_api_demo")
+
+    # Verify the test functions are available
+    missing = [name for name in DEVICE_ATTRIBUTE_TESTS if not callable(getattr(demo, name, None))]
+    if missing:
+        print(f"✗ Missing device attribute tests: {', '.join(missing)}")
+        sys.exit(1)
+
+    print("✓ Successfully imported new device attribute tests:\n")
+    for name in DEVICE_ATTRIBUTE_TESTS:
+        print(f"  - {name}()")
+    print()
+
+    print("Available test numbers in test_api_demo.py:")
+    for test_num, test_name, _, _ in demo.TESTS:
+        print(f"  {test_num}. {test_name}")
+    print()
+
+    attribute_nums = [str(test_num) for test_num, _, test_func, _ in demo.TESTS
+                      if test_func.__name__ in DEVICE_ATTRIBUTE_TESTS]
+    print("Usage Examples:")
+    print("  python test_api_demo.py              # Run all tests")
+    print(f"  python test_api_demo.py -t {attribute_nums[0]}         # Run test {attribute_nums[0]} (All Admin)")
+    print(f"  python test_api_demo.py -t {' '.join(attribute_nums)}   # Run all device attribute tests\n")
@@ -2,34 +2,44 @@
 Unit tests for the vectorized FastSimulator.
 """
 
+import importlib.util
 import unittest
 import numpy as np
-try:
-    import scipy.sparse as sparse
-    HAS_SCIPY = True
-except (ImportError, AttributeError):
-    HAS_SCIPY = False
 
-from simulation.fast_simulator import FastSimulator
+from network_model import NetworkGraph
+
+# Only probe for SciPy here (a top-level find_spec does not import it); SciPy
+# and the simulator module are imported in setUpClass so that collecting (or
+# deselecting) these tests does not load them
+HAS_SCIPY = importlib.util.find_spec("scipy") is not None
+
 
 class TestFastSimulator(unittest.TestCase):
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         if not HAS_SCIPY:
-            self.skipTest("SciPy not installed")
-            
+            raise unittest.SkipTest("SciPy not installed")
+        
+        import scipy.sparse as sparse
+        from simulation import fast_simulator
+        cls.sparse = sparse
+        cls.fast_simulator = fast_simulator
+        cls.FastSimulator = fast_simulator.FastSimulator
+        cls.run_batch = staticmethod(fast_simulator.run_batch)
+        cls.HAS_NUMBA = fast_simulator.HAS_NUMBA
+    
+    def _line_graph_adj(self, n):
+        """Adjacency of the line graph 0-1-...-(n-1): ones on the first off-diagonals."""
+        ones = np.ones(n - 1)
+        return self.sparse.diags([ones, ones], [-1, 1], shape=(n, n), format="csr")
+    
+    def setUp(self):
         # Create a simple 5-node line graph: 0-1-2-3-4
-        # Adjacency matrix (5x5)
-        # 0 connected to 1
-        # 1 connected to 0, 2
-        # ...
-        data = [1, 1, 1, 1, 1, 1, 1, 1]
-        row = [0, 1, 1, 2, 2, 3, 3, 4]
-        col = [1, 0, 2, 1, 3, 2, 4, 3]
-        self.adj = sparse.csr_matrix((data, (row, col)), shape=(5, 5))
+        self.adj = self._line_graph_adj(5)
 
     def test_initialization(self):
-        sim = FastSimulator(self.adj, infection_rate=1.0)
+        sim = self.FastSimulator(self.adj, infection_rate=1.0)
         sim.initialize([0])
         
         # Check initial state
@@ -39,7 +49,7 @@ class TestFastSimulator(unittest.TestCase):
 
     def test_propagation_no_latency(self):
         # 100% infection rate, 0 latency
-        sim = FastSimulator(self.adj, infection_rate=1.0, latency=0)
+        sim = self.FastSimulator(self.adj, infection_rate=1.0, latency=0)
         sim.initialize([0])
         
         # Step 1: 0 infects 1
@@ -54,17 +64,19 @@ class TestFastSimulator(unittest.TestCase):
 
     def test_propagation_with_latency(self):
         # 100% infection, 1 step latency
-        sim = FastSimulator(self.adj, infection_rate=1.0, latency=1)
+        sim = self.FastSimulator(self.adj, infection_rate=1.0, latency=1)
         sim.initialize([0]) # 0 is Infectious
         
         # Step 1: 0 exposes 1. 1 becomes Latent (1)
-        sim.step()
+        step_data = sim.step()
         self.assertEqual(sim.state[1], 1)
         self.assertEqual(sim.total_infected_count, 2)
+        self.assertEqual(step_data["latent_count"], 1)
         
         # Step 2: 1 finishes latency -> Infectious. 
         # But 1 was NOT infectious during step calculation, so 2 is NOT exposed yet.
-        sim.step()
+        step_data = sim.step()
+        self.assertEqual(step_data["latent_count"], 0)
         self.assertEqual(sim.state[1], 2) # Now infectious
         self.assertEqual(sim.state[2], 0) # Still susceptible
         
@@ -74,15 +86,47 @@ class TestFastSimulator(unittest.TestCase):
 
     def test_probabilistic_spread(self):
         # 0% infection rate
-        sim = FastSimulator(self.adj, infection_rate=0.0)
+        sim = self.FastSimulator(self.adj, infection_rate=0.0)
         sim.initialize([0])
         
         sim.step()
         self.assertEqual(sim.state[1], 0) # Should not infect
         self.assertEqual(sim.total_infected_count, 1)
 
+    def test_kernel_matches_numpy(self):
+        if not self.HAS_NUMBA:
+            self.skipTest("numba not installed")
+            
+        adj = self.sparse.random(200, 200, density=0.02, random_state=3, format="csr")
+        adj = adj + adj.T
+        
+        histories = []
+        for use_kernel in (True, False):
+            sim = self.FastSimulator(adj, infection_rate=1.0, latency=2)
+            sim._use_kernel = use_kernel
+            sim.initialize([0])
+            histories.append(sim.run(max_steps=30))
+        self.assertEqual(histories[0], histories[1])
+
+    def test_seed_reproducibility(self):
+        adj = self.sparse.random(300, 300, density=0.02, random_state=7, format="csr")
+        adj = adj + adj.T
+        
+        histories = []
+        for _ in range(2):
+            sim = self.FastSimulator(adj, infection_rate=0.3, latency=1, seed=123)
+            sim.initialize([0])
+            histories.append(sim.run(max_steps=30))
+        self.assertEqual(histories[0], histories[1])
+
+    def test_no_infectious_nodes(self):
+        # Without infectious nodes a step spreads nothing and run() stops at once
+        sim = self.FastSimulator(self.adj, infection_rate=1.0, latency=1)
+        history = sim.run(max_steps=10)
+        self.assertEqual(history, [{"step": 1, "newly_infected": 0, "total_infected": 0}])
+
     def test_run_loop(self):
-        sim = FastSimulator(self.adj, infection_rate=1.0, latency=0)
+        sim = self.FastSimulator(self.adj, infection_rate=1.0, latency=0)
         sim.initialize([0])
         
         history = sim.run(max_steps=10)
@@ -91,5 +135,100 @@ class TestFastSimulator(unittest.TestCase):
         self.assertEqual(sim.total_infected_count, 5)
         self.assertTrue(len(history) >= 4)
 
+    def test_deterministic_run_matches_steps(self):
+        # run() takes the BFS shortcut for rate 1 / latency 0; it must match stepping
+        adj = self.sparse.random(200, 200, density=0.01, random_state=11, format="csr")
+        adj = adj + adj.T
+        
+        for max_steps in (3, 100):
+            stepped = self.FastSimulator(adj, infection_rate=1.0, latency=0)
+            stepped.initialize([0, 5])
+            for _ in range(max_steps):
+                if stepped.step()["newly_infected"] == 0:
+                    break
+            
+            sim = self.FastSimulator(adj, infection_rate=1.0, latency=0)
+            sim.initialize([0, 5])
+            self.assertEqual(sim.run(max_steps=max_steps), stepped.history)
+            self.assertTrue(np.array_equal(sim.state, stepped.state))
+            self.assertEqual(sim.current_step, stepped.current_step)
+
+    def test_adjacency_coercion(self):
+        # Weighted COO input is converted to a structural uint8 CSR matrix
+        sim = self.FastSimulator(self.adj.tocoo().astype(np.float64) * 0.5, infection_rate=1.0, latency=0)
+        self.assertEqual(sim.adj_matrix.format, "csr")
+        self.assertEqual(sim.adj_matrix.dtype, np.uint8)
+        self.assertTrue(np.all(sim.adj_matrix.data == 1))
+        
+        sim.initialize([0])
+        sim.step()
+        self.assertEqual(sim.state[1], 2)
+
+    def test_network_graph_input(self):
+        # A NetworkGraph is simulated through its cached CSR adjacency
+        network = NetworkGraph()
+        for i in range(5):
+            network.add_device(f"device_{i}")
+        for i in range(4):
+            network.add_connection(f"device_{i}", f"device_{i + 1}")
+        
+        sim = self.FastSimulator(network, infection_rate=1.0, latency=0)
+        self.assertIs(network.csr, network.csr)
+        sim.initialize([0])
+        sim.run(max_steps=10)
+        self.assertEqual(sim.total_infected_count, 5)
+
+    def test_high_degree_exposure(self):
+        # Star graph: 256 infectious leaves must still expose the hub (no uint8 wraparound)
+        leaves = np.arange(1, 257)
+        star = self.sparse.coo_matrix(
+            (np.ones(512), (np.r_[np.zeros(256, dtype=int), leaves], np.r_[leaves, np.zeros(256, dtype=int)])),
+            shape=(257, 257)
+        )
+        sim = self.FastSimulator(star, infection_rate=1.0, latency=0)
+        sim.initialize(leaves.tolist())
+        sim.step()
+        self.assertEqual(sim.state[0], 2)
+
+    def test_matvec_saturates(self):
+        if not self.HAS_NUMBA:
+            self.skipTest("numba not installed")
+            
+        # Hub with 300 infectious neighbors: a uint8 output clamps at 255 instead of wrapping
+        leaves = np.arange(1, 301)
+        indptr = np.r_[0, np.full(301, 300)].astype(np.int32)
+        out = np.empty(301, dtype=np.uint8)
+        self.fast_simulator._csr_bool_matvec(indptr, leaves.astype(np.int32), np.ones(301, dtype=np.uint8), out)
+        self.assertEqual(out[0], 255)
+        self.assertTrue(np.all(out[1:] == 0))
+
+    def test_sparse_frontier_matches_full_spmv(self):
+        # Column-slice exposure and full SpMV must yield identical deterministic runs
+        adj = self.sparse.random(200, 200, density=0.02, random_state=42, format="csr")
+        adj = adj + adj.T
+        
+        histories = []
+        for ratio in (0.0, 1.1):
+            sim = self.FastSimulator(adj, infection_rate=1.0, latency=1)
+            sim.SPARSE_FRONTIER_RATIO = ratio
+            sim.initialize([0, 1])
+            histories.append(sim.run(max_steps=20))
+        self.assertEqual(histories[0], histories[1])
+
+    def test_run_batch(self):
+        configs = [
+            {"infection_rate": 1.0, "latency": 0, "initial_infected": [0], "max_steps": 10},
+            {"infection_rate": 0.5, "latency": 1, "initial_infected": [2], "max_steps": 10, "seed": 5},
+        ]
+        histories = self.run_batch(self.adj, configs, n_workers=2)
+        
+        self.assertEqual(len(histories), 2)
+        self.assertEqual(histories[0][-1]["total_infected"], 5)
+        
+        sim = self.FastSimulator(self.adj, infection_rate=0.5, latency=1, seed=5)
+        sim.initialize([2])
+        self.assertEqual(histories[1], sim.run(max_steps=10))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -27,6 +27,13 @@ class TestMalware(unittest.TestCase):
         self.malware.mark_infected("device_2")
         self.assertEqual(self.malware.get_infected_count(), 2)
 
+    def test_reset(self):
+        """Test that reset clears infections but keeps the configuration."""
+        self.malware.mark_infected("device_1")
+        self.malware.reset()
+        self.assertEqual(self.malware.get_infected_count(), 0)
+        self.assertEqual(self.malware.infection_rate, 0.5)
+
     def test_behavior_config(self):
         """Test that configuration is correctly reflected."""
         m = Malware("m2", target_os=["Windows"], avoids_admin=True)
@@ -1,6 +1,9 @@
 """Unit tests for network model."""
 
+import os
+import tempfile
 import unittest
+import numpy as np
 from network_model import NetworkGraph
 
 
@@ -27,6 +30,33 @@ class TestNetworkGraph(unittest.TestCase):
         """Test generating a network topology."""
         self.network.generate_topology(num_nodes=10)
         self.assertEqual(self.network.graph.number_of_nodes(), 10)
+        self.assertEqual(self.network.device_ids, [f"device_{i}" for i in range(10)])
+
+        # Past the bulk-insert threshold as well
+        network = NetworkGraph(network_type="small_world")
+        network.generate_topology(num_nodes=3000)
+        self.assertEqual(network.device_ids, list(network.graph.nodes))
+
+    def test_generate_segmented_topology(self):
+        """Test generating a segmented topology with a firewalled bridge."""
+        network = NetworkGraph(network_type="segmented")
+        network.generate_topology(
+            0,
+            subnets=[
+                {"num_nodes": 10, "network_type": "complete", "device_attributes": {"os": "Linux"}},
+                {"num_nodes": 5, "network_type": "complete", "device_attributes": {"os": "Windows"}},
+            ],
+            interconnects=[{"source_subnet": 0, "target_subnet": 1, "firewall": True}],
+        )
+        self.assertEqual(network.graph.number_of_nodes(), 15)
+        self.assertEqual(network.graph.number_of_edges(), 45 + 10 + 1)
+        self.assertTrue(network.graph.has_edge("device_0", "device_10"))
+        self.assertFalse(network.graph.has_edge("device_9", "device_10"))
+        self.assertEqual(network.get_device_attributes("device_14")["os"], "Windows")
+        self.assertTrue(network.get_device_attributes("device_10")["firewall_enabled"])
+        self.assertIsNone(network.get_device_attributes("device_11")["firewall_enabled"])
+        self.assertEqual(network.device_states["device_14"], "healthy")
+        self.assertEqual(network.device_ids, list(network.graph.nodes))
 
     def test_get_neighbors(self):
         """Test getting neighbors of a device."""
@@ -41,6 +71,110 @@ class TestNetworkGraph(unittest.TestCase):
         self.assertIn("device_2", neighbors)
         self.assertIn("device_3", neighbors)
 
+    def test_statistics_demographics(self):
+        """Test OS breakdown and admin ratio follow attribute changes."""
+        self.network.generate_topology(num_nodes=10, device_attributes={"os": "Windows"})
+        self.network.set_device_attributes("device_0", os="Linux", admin_user=False)
+        self.network.add_device("device_10", os="Linux")
+
+        demographics = self.network.get_statistics(skip_expensive=True)["demographics"]
+        self.assertEqual(demographics["os_breakdown"], {"Linux": 2, "Windows": 9})
+        self.assertAlmostEqual(demographics["admin_ratio"], 10 / 11)
+        self.assertEqual(self.network.get_os_breakdown(["device_0", "device_1", "device_10"]),
+                         {"Linux": 2, "Windows": 1})
+
+    def test_attr_index_follows_graph(self):
+        """Test the attribute index covers implicit nodes and regenerated topologies."""
+        self.network.add_device("a", os="Windows")
+        self.network.add_connection("a", "b")
+        self.network.set_device_attributes("b", os="Linux")
+        self.assertEqual(self.network.get_os_breakdown(), {"Windows": 1, "Linux": 1})
+        self.assertEqual(self.network.device_ids, ["a", "b"])
+
+        network = NetworkGraph()
+        network.generate_topology(num_nodes=5)
+        network.generate_topology(num_nodes=5, device_attributes={"os": "Linux", "admin_user": False})
+        self.assertEqual(len(network.device_ids), 5)
+        demographics = network.get_statistics(skip_expensive=True)["demographics"]
+        self.assertEqual(demographics["os_breakdown"], {"Linux": 5})
+        self.assertEqual(demographics["admin_ratio"], 0)
+
+    def test_set_device_attributes_bulk(self):
+        """Test bulk attribute updates reach the graph and the attribute columns."""
+        self.network.generate_topology(num_nodes=10, device_attributes={"os": "Windows"})
+        self.network.set_device_attributes_bulk({
+            "device_0": {"os": "Linux", "vulnerabilities": ["CVE-1"]},
+            "device_1": {"admin_user": False},
+        })
+        self.assertEqual(self.network.get_device_attributes("device_0")["vulnerabilities"], {"CVE-1"})
+        self.assertFalse(self.network.get_device_attributes("device_1")["admin_user"])
+        self.assertEqual(self.network.get_os_breakdown(), {"Linux": 1, "Windows": 9})
+        self.assertAlmostEqual(self.network.get_statistics(skip_expensive=True)["demographics"]["admin_ratio"], 0.9)
+
+        with self.assertRaises(ValueError):
+            self.network.set_device_attributes_bulk({"device_99": {"admin_user": False}})
+
+    def test_get_all_device_attributes(self):
+        """Test the bulk attribute accessor returns read-only views keyed by device ID."""
+        self.network.generate_topology(num_nodes=5, device_attributes={"os": "Linux"})
+        attrs_by_device = self.network.get_all_device_attributes()
+        self.assertEqual(len(attrs_by_device), 5)
+        self.assertEqual(attrs_by_device["device_4"]["os"], "Linux")
+        with self.assertRaises(TypeError):
+            attrs_by_device["device_4"]["os"] = "Windows"
+
+        self.assertEqual(list(self.network.get_all_device_attributes(["device_1", "device_0"])),
+                         ["device_1", "device_0"])
+        with self.assertRaises(ValueError):
+            self.network.get_all_device_attributes(["device_99"])
+
+    def test_attribute_mask(self):
+        """Test boolean attribute masks follow graph.nodes order and attribute changes."""
+        self.network.generate_topology(num_nodes=5)
+        self.network.set_device_attributes("device_1", admin_user=False, antivirus=True)
+        self.assertEqual(self.network.attribute_mask("admin_user").tolist(), [True, False, True, True, True])
+        self.assertEqual(self.network.attribute_mask("antivirus").tolist(), [False, True, False, False, False])
+        self.assertEqual(self.network.attribute_mask("admin_user", ["device_1", "device_0"]).tolist(),
+                         [False, True])
+        with self.assertRaises(ValueError):
+            self.network.attribute_mask("admin_user", ["device_99"])
+
+    def test_attribute_mask_large_topology(self):
+        """Test masks stay aligned with graph.nodes past the bulk-insert threshold."""
+        network = NetworkGraph(network_type="small_world")
+        network.generate_topology(num_nodes=5000)
+        network.set_device_attributes_bulk({f"device_{i}": {"admin_user": False} for i in range(0, 5000, 7)})
+        expected = np.array([attrs["admin_user"] for _, attrs in network.graph.nodes(data=True)])
+        self.assertTrue(np.array_equal(network.attribute_mask("admin_user"), expected))
+
+    def test_csr_cache(self):
+        """Test that the cached CSR adjacency follows topology changes."""
+        self.network.add_device("device_1")
+        self.network.add_device("device_2")
+        self.assertEqual(self.network.csr.nnz, 0)
+        self.assertIs(self.network.csr, self.network.csr)
+
+        self.network.add_connection("device_1", "device_2")
+        self.assertEqual(self.network.csr.nnz, 2)
+        self.assertEqual(self.network.csr.dtype, np.uint8)
+
+    def test_pickle_roundtrip(self):
+        """Test saving and loading a network with pickle."""
+        self.network.generate_topology(num_nodes=20, device_attributes={"os": "Linux"})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "network.pkl")
+            self.network.to_pickle(path)
+
+            loaded = NetworkGraph()
+            loaded.from_pickle(path)
+
+        self.assertEqual(loaded.network_type, "scale_free")
+        self.assertEqual(loaded.graph.number_of_nodes(), 20)
+        self.assertEqual(loaded.graph.number_of_edges(), self.network.graph.number_of_edges())
+        self.assertEqual(loaded.get_device_attributes("device_0")["os"], "Linux")
+        self.assertEqual(loaded.device_states["device_0"], "healthy")
+        self.assertEqual(loaded.device_ids, self.network.device_ids)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,115 @@
+"""Unit tests for the object-based Simulator."""
+
+import unittest
+from network_model import NetworkGraph
+from malware_engine.malware_base import Malware
+from simulation import Simulator
+from simulation.simulator import HAS_NUMBA
+
+
+class TestSimulator(unittest.TestCase):
+    """Test cases for Simulator class."""
+
+    def setUp(self):
+        """Set up a 6-device line network: device_0 - device_1 - ... - device_5."""
+        self.network = NetworkGraph()
+        for i in range(6):
+            self.network.add_device(f"device_{i}", os="Windows")
+        for i in range(5):
+            self.network.add_connection(f"device_{i}", f"device_{i + 1}")
+
+    def _run(self, use_kernel: bool, **malware_kwargs) -> Simulator:
+        malware = Malware("malware_1", infection_rate=1.0, **malware_kwargs)
+        simulator = Simulator(self.network, malware)
+        simulator._use_kernel = use_kernel
+        simulator.initialize(["device_0"])
+        simulator.run(max_steps=10)
+        return simulator
+
+    def test_python_spread(self):
+        """Test that the pure Python path infects one hop per step."""
+        simulator = self._run(use_kernel=False)
+        self.assertEqual(simulator.malware.get_infected_count(), 6)
+        self.assertEqual(simulator.infection_timeline["device_5"], 5)
+
+    def test_infected_mask(self):
+        """Test the infection mask follows graph.nodes order and is read-only."""
+        self.network.set_device_attributes("device_1", admin_user=False)
+        simulator = Simulator(self.network, Malware("malware_1", infection_rate=1.0))
+        simulator.initialize(["device_1", "device_2"])
+        mask = simulator.infected_mask
+        self.assertEqual(mask.tolist(), [False, True, True, False, False, False])
+        self.assertEqual(int((mask & self.network.attribute_mask("admin_user")).sum()), 1)
+        with self.assertRaises(ValueError):
+            mask[0] = True
+
+    def test_initialize_unknown_device(self):
+        """Test that initializing with an unknown device ID is rejected."""
+        simulator = Simulator(self.network, Malware("malware_1"))
+        with self.assertRaises(ValueError):
+            simulator.initialize(["device_0", "device_99"])
+        self.assertEqual(simulator.malware.get_infected_count(), 0)
+
+    def test_history(self):
+        """Test that step history materializes as dicts and feeds the statistics."""
+        simulator = self._run(use_kernel=False)
+        history = simulator.history
+        self.assertEqual(history[-1]["total_infected"], 6)
+        self.assertEqual(history[0], {"step": 1, "newly_infected": 1, "total_infected": 2,
+                                      "devices_infected": ["device_1"]})
+        stats = simulator.get_statistics()
+        self.assertEqual(stats["performance"]["peak_velocity"], 1)
+        self.assertEqual(stats["performance"]["step_at_peak"], 1)
+        self.assertEqual(stats["performance"]["steps_to_50_percent"], 2)
+        self.assertEqual(stats["performance"]["steps_to_90_percent"], 5)
+        self.assertEqual(simulator.get_statistics(history_limit=2)["history"], history[:2])
+        self.assertEqual(simulator.get_statistics(history_limit=0)["history"], [])
+        self.assertEqual(simulator.get_statistics(history_limit=-1)["history"], [])
+
+        simulator.reset()
+        self.assertEqual(simulator.history, [])
+
+    def test_reset_reseeds(self):
+        """Test that a reset simulator can be re-seeded and rerun from scratch."""
+        simulator = self._run(use_kernel=False)
+        simulator.reset(["device_5"])
+        self.assertEqual(simulator.malware.infected_devices, {"device_5"})
+        self.assertEqual(simulator.infection_timeline, {"device_5": 0})
+
+        simulator.run(max_steps=10)
+        self.assertEqual(simulator.infection_timeline["device_0"], 5)
+
+    def test_kernel_matches_python(self):
+        """Test that the compiled kernel applies the same rules as Malware.spread."""
+        if not HAS_NUMBA:
+            self.skipTest("numba not installed")
+
+        self.network.set_device_attributes("device_3", patch_status="fully_patched")
+        self.network.set_device_attributes("device_2", admin_user=False)
+
+        for kwargs in ({}, {"avoids_admin": True}, {"zero_day": True}, {"target_os": ["linux"]}):
+            kernel = self._run(use_kernel=True, **kwargs)
+            python = self._run(use_kernel=False, **kwargs)
+            self.assertEqual(kernel.malware.infected_devices, python.malware.infected_devices, kwargs)
+            self.assertEqual(kernel.infection_timeline, python.infection_timeline, kwargs)
+
+    def test_seed_reproduces_run(self):
+        """Test that a seed reproduces a probabilistic run on both step paths."""
+        network = NetworkGraph(network_type="small_world")
+        network.generate_topology(num_nodes=100)
+
+        def timeline(use_kernel, seed):
+            simulator = Simulator(network, Malware("malware_1", infection_rate=0.5), seed=seed)
+            simulator._use_kernel = use_kernel
+            simulator.initialize(["device_0"])
+            simulator.run(max_steps=50)
+            return simulator.infection_timeline
+
+        for use_kernel in (False, True) if HAS_NUMBA else (False,):
+            with self.subTest(use_kernel=use_kernel):
+                self.assertEqual(timeline(use_kernel, 7), timeline(use_kernel, 7))
+                self.assertNotEqual(timeline(use_kernel, 7), timeline(use_kernel, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()